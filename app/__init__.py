@@ -4,11 +4,14 @@ import os
 
 from flask import Flask
 from flask_cors import CORS
+from flask_orjson import OrjsonProvider
 
-from .config import get_config
+from .config import DEFAULT_SECRET_KEY, get_config
 from .db import SessionLocal, init_db
 from .observability import init_observability
+from .api.converters import PasteIdConverter
 from .api.pastes import api_bp
+from .worker.access_log_buffer import start_access_log_buffer
 from .worker.expiry_worker import start_expiry_worker
 
 def create_app(env_name: str | None = None) -> Flask:
@@ -23,9 +26,20 @@ def create_app(env_name: str | None = None) -> Flask:
         env_name = os.getenv("APP_ENV", "development")
 
     app = Flask(__name__)
+    # orjson handles request parsing and response serialization (including
+    # the UUID/datetime values in paste DTOs) natively.
+    app.json = OrjsonProvider(app)
     app_config = get_config(env_name)
     app.config.from_object(app_config)
 
+    # SECRET_KEY signs the view tokens that stand in for a paste's password;
+    # with the public default anyone could forge them.
+    if not app.config.get("TESTING", False) and app.config.get("SECRET_KEY") in (
+        None,
+        "",
+        DEFAULT_SECRET_KEY,
+    ):
+        raise RuntimeError("SECRET_KEY must be set to a private value outside testing.")
 
     CORS(
         app
@@ -35,12 +49,15 @@ def create_app(env_name: str | None = None) -> Flask:
     init_db(app)
     init_observability(app)
 
-    # Register API blueprints
+    # Register API blueprints (URL converters must exist before their routes)
+    app.url_map.converters["pid"] = PasteIdConverter
     app.register_blueprint(api_bp)
 
-    # Start background expiry worker (disabled in testing)
+    # Start background expiry worker and access log flusher (disabled in
+    # testing, where access logs are written synchronously)
     if not app.config.get("TESTING", False):
         start_expiry_worker(app)
+        start_access_log_buffer(app)
 
     return app
 
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import re
+import uuid
+
+from werkzeug.exceptions import BadRequest
+from werkzeug.routing import BaseConverter
+
+
+# Canonical hyphenated UUID form; lets malformed ids be rejected without
+# raising and catching ValueError inside uuid.UUID().
+_UUID_RE = re.compile(
+    r"\A[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\Z"
+)
+
+
+class InvalidPasteId(BadRequest):
+    """Raised during URL matching when a paste id is not a valid UUID."""
+
+    description = "Invalid paste id"
+
+
+class PasteIdConverter(BaseConverter):
+    """
+    URL converter for ``<pid:...>`` segments, yielding a ``uuid.UUID``.
+
+    Werkzeug's built-in ``uuid`` converter makes the route not match (404);
+    this one raises ``InvalidPasteId`` instead so malformed ids keep getting
+    a 400 before the view function is entered.
+    """
+
+    def to_python(self, value: str) -> uuid.UUID:
+        if not _UUID_RE.match(value):
+            raise InvalidPasteId()
+        return uuid.UUID(value)
+
+    def to_url(self, value: uuid.UUID | str) -> str:
+        return str(value)
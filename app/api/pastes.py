@@ -3,8 +3,12 @@ from __future__ import annotations
 import uuid
 from http import HTTPStatus
 
-from flask import Blueprint, request
+import orjson
+from flask import Blueprint, Response, current_app, request
+from pydantic import ValidationError
+from werkzeug.http import generate_etag
 
+from app.api.converters import InvalidPasteId
 from app.api.schemas import HealthResponse, PasteCreateRequest
 from app.services.paste_service import (
     InvalidPasteParameters,
@@ -14,15 +18,45 @@ from app.services.paste_service import (
 from app.db import SessionLocal
 from app.services.paste_service import PasteService
 from app.services.helpers import hash_password
+from app.worker.access_log_buffer import access_log_buffer
 
 api_bp = Blueprint("api", __name__)
 
+# PasteService is stateless (each use case opens its own session), so a single
+# instance is shared across requests.
+_paste_service = PasteService(
+    session_factory=SessionLocal,
+    access_log_buffer=access_log_buffer,
+)
+_validate_paste_create_json = PasteCreateRequest.model_validate_json
+
+# The health body never changes; serialize it (and its ETag) once.
+_HEALTH_BYTES = orjson.dumps(HealthResponse().model_dump(mode="json"))
+_HEALTH_ETAG = generate_etag(_HEALTH_BYTES)
+
+
+@api_bp.app_errorhandler(InvalidPasteId)
+def _invalid_paste_id(_exc: InvalidPasteId) -> tuple[dict, int]:
+    """Render ``<pid:...>`` URL conversion failures as a JSON 400."""
+
+    return {"error": "Invalid paste id"}, HTTPStatus.BAD_REQUEST
+
+
 @api_bp.route("/health", methods=["GET"])
-def health() -> tuple[dict, int]:
-    """Simple health check endpoint."""
+def health() -> Response:
+    """
+    Simple health check endpoint.
 
-    body = HealthResponse().model_dump()
-    return body, HTTPStatus.OK
+    A matching ``If-None-Match`` is answered with ``304 Not Modified``.
+    """
+
+    response = current_app.response_class(
+        _HEALTH_BYTES,
+        status=HTTPStatus.OK,
+        mimetype="application/json",
+    )
+    response.set_etag(_HEALTH_ETAG)
+    return response.make_conditional(request)
 
 
 @api_bp.route("/pastes", methods=["POST"])
@@ -31,15 +65,28 @@ def create_paste() -> tuple[dict, int]:
     Create a new paste.
 
     Validation is handled by Pydantic; business rules by the service layer.
+    The raw body is parsed and validated in one pass by Pydantic's JSON
+    parser, without building an intermediate dict.
     """
+    # An empty body validates like ``{}`` (missing fields) rather than as
+    # malformed JSON; anything else must be sent as JSON.
+    raw_body = request.get_data(cache=False) or b"{}"
+    if raw_body != b"{}" and not request.is_json:
+        details = [
+            {"type": "content_type", "loc": [], "msg": "Content-Type must be application/json"}
+        ]
+        return {"error": "Invalid request body", "details": details}, HTTPStatus.BAD_REQUEST
+
     try:
-        payload = PasteCreateRequest.model_validate(request.get_json() or {})
-    except Exception as exc:  # Pydantic validation error
-        return {"error": "Invalid request body", "details": str(exc)}, HTTPStatus.BAD_REQUEST
+        payload = _validate_paste_create_json(raw_body)
+    except ValidationError as exc:
+        # Inputs are left out: they may be raw bytes (malformed JSON) or the
+        # full paste content.
+        details = exc.errors(include_url=False, include_context=False, include_input=False)
+        return {"error": "Invalid request body", "details": details}, HTTPStatus.BAD_REQUEST
 
-    paste_service = PasteService(session_factory=SessionLocal)
     try:
-        dto = paste_service.create_paste(
+        dto = _paste_service.create_paste(
             content=payload.content,
             max_views=payload.max_views,
             expires_at=payload.expires_at,
@@ -51,23 +98,20 @@ def create_paste() -> tuple[dict, int]:
     return dto, HTTPStatus.CREATED
 
 
-@api_bp.route("/pastes/<paste_id>/view", methods=["POST"])
-def view_paste(paste_id: str) -> tuple[dict, int]:
-    try:
-        uid = uuid.UUID(paste_id)
-    except ValueError:
-        return {"error": "Invalid paste id"}, HTTPStatus.BAD_REQUEST
-
+@api_bp.route("/pastes/<pid:paste_id>/view", methods=["POST"])
+def view_paste(paste_id: uuid.UUID) -> tuple[dict, int]:
     data = request.get_json(silent=True) or {}
     provided_password = data.get("password")
 
-    paste_service = PasteService(session_factory=SessionLocal)
-
+    # A valid X-Paste-Token (returned by an earlier password-checked view)
+    # proves the password was checked recently, so bcrypt can be skipped.
     try:
-        dto = paste_service.retrieve_paste_for_view(
-            paste_id=uid,
+        dto = _paste_service.retrieve_paste_for_view(
+            paste_id=paste_id,
             ip_address=request.remote_addr,
             provided_password=provided_password,
+            view_token=request.headers.get("X-Paste-Token"),
+            secret_key=current_app.config["SECRET_KEY"],
         )
     except PasteNotFoundError as exc:
         return {"error": str(exc)}, HTTPStatus.NOT_FOUND
@@ -79,8 +123,8 @@ def view_paste(paste_id: str) -> tuple[dict, int]:
     return dto, HTTPStatus.OK
 
 
-@api_bp.route("/pastes/<paste_id>", methods=["DELETE"])
-def delete_paste(paste_id: str) -> tuple[dict, int]:
+@api_bp.route("/pastes/<pid:paste_id>", methods=["DELETE"])
+def delete_paste(paste_id: uuid.UUID) -> tuple[dict, int]:
     """
     Logically delete a paste by transitioning it to the DELETED state.
 
@@ -88,13 +132,7 @@ def delete_paste(paste_id: str) -> tuple[dict, int]:
     invoked indirectly through the service layer.
     """
     try:
-        uid = uuid.UUID(paste_id)
-    except ValueError:
-        return {"error": "Invalid paste id"}, HTTPStatus.BAD_REQUEST
-
-    paste_service = PasteService(session_factory=SessionLocal)
-    try:
-        dto = paste_service.delete_paste(uid)
+        dto = _paste_service.delete_paste(paste_id)
     except PasteNotFoundError as exc:
         return {"error": str(exc)}, HTTPStatus.NOT_FOUND
     except PasteUnavailableError as exc:
@@ -4,14 +4,17 @@ from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# Public placeholder; only acceptable under TESTING (see ``create_app``).
+DEFAULT_SECRET_KEY = "dev-secret-key-change-me"
+
 
 class BaseConfig:
     """Base application configuration shared across environments."""
 
     APP_NAME: str = "backend"
 
-    # Security
-    SECRET_KEY: str = os.getenv("SECRET_KEY", "dev-secret-key-change-me")
+    # Security. Signs paste view tokens, so it must be private outside testing.
+    SECRET_KEY: str = os.getenv("SECRET_KEY", DEFAULT_SECRET_KEY)
 
     # Database
     SQLALCHEMY_DATABASE_URI: str = os.getenv(
@@ -20,6 +23,32 @@ class BaseConfig:
     )
     SQLALCHEMY_ECHO: bool = False
     SQLALCHEMY_FUTURE: bool = True
+    # Entries in SQLAlchemy's compiled-statement LRU cache (default 500).
+    SQLALCHEMY_QUERY_CACHE_SIZE: int = int(
+        os.getenv("SQLALCHEMY_QUERY_CACHE_SIZE", "1200")
+    )
+
+    # Connection pool (per process). Keep DB_POOL_SIZE + DB_MAX_OVERFLOW,
+    # multiplied by the number of gunicorn workers, below Postgres'
+    # ``max_connections``.
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "20"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "5"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+
+    # psycopg 3 prepares a statement server-side once it has run this many
+    # times on a connection. Set DB_PREPARE_THRESHOLD=none to disable, which
+    # is required behind PgBouncer in transaction pooling mode.
+    DB_PREPARE_THRESHOLD: int | None = (
+        None
+        if os.getenv("DB_PREPARE_THRESHOLD", "3").lower() == "none"
+        else int(os.getenv("DB_PREPARE_THRESHOLD", "3"))
+    )
+
+    # Access logs are buffered in memory and written in batches of up to
+    # ACCESS_LOG_BATCH_SIZE rows, at least every ACCESS_LOG_BATCH_MS.
+    ACCESS_LOG_BATCH_SIZE: int = int(os.getenv("ACCESS_LOG_BATCH_SIZE", "256"))
+    ACCESS_LOG_BATCH_MS: int = int(os.getenv("ACCESS_LOG_BATCH_MS", "50"))
 
     # Alembic
     ALEMBIC_CONFIG: str = os.getenv(
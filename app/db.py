@@ -4,7 +4,7 @@ import typing as t
 
 from flask import Flask
 from sqlalchemy import create_engine
-from sqlalchemy.engine import Engine
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import declarative_base, scoped_session, sessionmaker
 
 
@@ -42,11 +42,29 @@ def init_db(app: Flask) -> None:
             "SQLALCHEMY_DATABASE_URI is not configured on the Flask app."
         )
 
-    _engine = create_engine(
-        database_uri,
-        future=app.config.get("SQLALCHEMY_FUTURE", True),
-        echo=app.config.get("SQLALCHEMY_ECHO", False),
-    )
+    url = make_url(database_uri)
+    engine_options: dict[str, t.Any] = {
+        "future": app.config.get("SQLALCHEMY_FUTURE", True),
+        "echo": app.config.get("SQLALCHEMY_ECHO", False),
+        "query_cache_size": app.config.get("SQLALCHEMY_QUERY_CACHE_SIZE", 1200),
+    }
+
+    # SQLite (local experiments only) does not use a QueuePool.
+    if url.get_backend_name() != "sqlite":
+        engine_options.update(
+            pool_size=app.config.get("DB_POOL_SIZE", 20),
+            max_overflow=app.config.get("DB_MAX_OVERFLOW", 10),
+            pool_timeout=app.config.get("DB_POOL_TIMEOUT", 5),
+            pool_recycle=app.config.get("DB_POOL_RECYCLE", 1800),
+            pool_pre_ping=True,
+        )
+
+    if url.get_driver_name() == "psycopg":
+        engine_options["connect_args"] = {
+            "prepare_threshold": app.config.get("DB_PREPARE_THRESHOLD"),
+        }
+
+    _engine = create_engine(url, **engine_options)
     SessionLocal.configure(bind=_engine)
 
     @app.teardown_appcontext
@@ -10,10 +10,12 @@ from sqlalchemy import (
     DateTime,
     Enum,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
     func,
+    text,
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
@@ -38,6 +40,15 @@ class Paste(Base):
             "current_views >= 0",
             name="ck_pastes_current_views_non_negative",
         ),
+        # Partial index serving the expiry worker; only pastes that can still
+        # expire are indexed, so it stays small as EXPIRED/DELETED rows pile up.
+        Index(
+            "ix_pastes_expiry",
+            "expires_at",
+            postgresql_where=text(
+                "status IN ('ACTIVE', 'VIEWED') AND expires_at IS NOT NULL"
+            ),
+        ),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(
@@ -126,3 +137,11 @@ class AccessLog(Base):
 
     paste: Mapped["Paste"] = relationship(back_populates="access_logs")
 
+
+# Serves per-paste access log queries (newest first) and the paste_id foreign
+# key; replaces the single-column ix_access_logs_paste_id.
+Index(
+    "ix_access_logs_paste_id_accessed_at",
+    AccessLog.paste_id,
+    AccessLog.accessed_at.desc(),
+)
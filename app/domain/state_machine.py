@@ -9,13 +9,14 @@ class InvalidPasteStateTransition(Exception):
     """Raised when an invalid state transition is requested for a Paste."""
 
 
-# Explicitly enumerated allowed transitions between distinct states.
-_ALLOWED_TRANSITIONS: set[tuple[PasteStatus, PasteStatus]] = {
-    (PasteStatus.ACTIVE, PasteStatus.VIEWED),
-    (PasteStatus.ACTIVE, PasteStatus.EXPIRED),
-    (PasteStatus.VIEWED, PasteStatus.EXPIRED),
-    (PasteStatus.ACTIVE, PasteStatus.DELETED),
-    (PasteStatus.VIEWED, PasteStatus.DELETED),
+# Explicitly enumerated allowed target states for each source state.
+_ALLOWED_TRANSITIONS: dict[PasteStatus, frozenset[PasteStatus]] = {
+    PasteStatus.ACTIVE: frozenset(
+        {PasteStatus.VIEWED, PasteStatus.EXPIRED, PasteStatus.DELETED}
+    ),
+    PasteStatus.VIEWED: frozenset({PasteStatus.EXPIRED, PasteStatus.DELETED}),
+    PasteStatus.EXPIRED: frozenset(),
+    PasteStatus.DELETED: frozenset(),
 }
 
 
@@ -53,7 +54,7 @@ def validate_transition(
     if current is target:
         return
 
-    if (current, target) not in _ALLOWED_TRANSITIONS:
+    if target not in _ALLOWED_TRANSITIONS[current]:
         raise InvalidPasteStateTransition(
             f"Cannot transition Paste from {current.value} to {target.value}."
         )
@@ -1,14 +1,20 @@
 from __future__ import annotations
 
-import json
 import logging
-from datetime import datetime, timezone
+import time
+from contextvars import ContextVar
 from typing import Any
-from uuid import uuid4
+from uuid import UUID, uuid4
 
+import orjson
 from flask import Flask, g, request
 
 
+# Correlation id of the request being handled. A ContextVar is cheaper to read
+# than ``g`` and stays isolated per thread/greenlet.
+_correlation_id: ContextVar[str | None] = ContextVar("correlation_id", default=None)
+
+
 class _RequestContextFilter(logging.Filter):
     """
     Logging filter that enriches records with request-scoped information.
@@ -25,6 +31,19 @@ class _RequestContextFilter(logging.Filter):
         return True
 
 
+# Common structured fields we care about.
+_STRUCTURED_FIELDS: tuple[str, ...] = (
+    "event",
+    "correlation_id",
+    "http_method",
+    "http_path",
+    "paste_id",
+    "status_from",
+    "status_to",
+    "error_type",
+)
+
+
 class JsonFormatter(logging.Formatter):
     """
     Simple JSON log formatter for structured logging.
@@ -32,31 +51,30 @@ class JsonFormatter(logging.Formatter):
 
     def format(self, record: logging.LogRecord) -> str:  # type: ignore[override]
         log: dict[str, Any] = {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            # Derived from the record's own creation time (UTC, millisecond
+            # precision) instead of reading the clock again.
+            "timestamp": (
+                time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created))
+                + f".{int(record.msecs):03d}Z"
+            ),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
         }
 
-        # Common structured fields we care about.
-        for key in (
-            "event",
-            "correlation_id",
-            "http_method",
-            "http_path",
-            "paste_id",
-            "status_from",
-            "status_to",
-            "error_type",
-        ):
-            value = getattr(record, key, None)
-            if value is not None:
-                log[key] = value
+        _getattr = getattr
+        log.update(
+            {
+                key: value
+                for key in _STRUCTURED_FIELDS
+                if (value := _getattr(record, key, None)) is not None
+            }
+        )
 
         if record.exc_info:
             log["exc_info"] = self.formatException(record.exc_info)
 
-        return json.dumps(log, ensure_ascii=False)
+        return orjson.dumps(log).decode("utf-8")
 
 
 def get_correlation_id() -> str | None:
@@ -64,10 +82,25 @@ def get_correlation_id() -> str | None:
     Return the current request's correlation_id, if any.
     """
 
-    try:
-        return getattr(g, "correlation_id", None)
-    except RuntimeError:
-        return None
+    return _correlation_id.get()
+
+
+def log_extra(
+    event: str,
+    paste_id: UUID | None = None,
+    **fields: Any,
+) -> dict[str, Any]:
+    """
+    Build the ``extra`` mapping for a structured log call.
+
+    Adds the current correlation id and the string form of ``paste_id`` (if
+    given) to ``event`` and any additional structured ``fields``.
+    """
+
+    extra = {"event": event, "correlation_id": _correlation_id.get(), **fields}
+    if paste_id is not None:
+        extra["paste_id"] = str(paste_id)
+    return extra
 
 
 def _configure_logging() -> None:
@@ -100,6 +133,7 @@ def init_observability(app: Flask) -> None:
     def _set_correlation_id() -> None:  # type: ignore[unused-variable]
         incoming = request.headers.get("X-Correlation-ID")
         g.correlation_id = incoming or str(uuid4())
+        g.correlation_id_token = _correlation_id.set(g.correlation_id)
 
     @app.after_request
     def _propagate_correlation_id(response):  # type: ignore[unused-variable]
@@ -108,3 +142,9 @@ def init_observability(app: Flask) -> None:
             response.headers["X-Correlation-ID"] = cid
         return response
 
+    @app.teardown_request
+    def _reset_correlation_id(_exc: BaseException | None) -> None:  # type: ignore[unused-variable]
+        token = g.pop("correlation_id_token", None)
+        if token is not None:
+            _correlation_id.reset(token)
+
@@ -3,18 +3,121 @@ from __future__ import annotations
 import logging
 import uuid
 from datetime import datetime, UTC
-from typing import Optional
-
-from sqlalchemy import Select, Update, select, update
+from typing import Any, Optional
+
+from sqlalchemy import (
+    RowMapping,
+    Select,
+    Update,
+    bindparam,
+    case,
+    cast,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    update,
+)
 from sqlalchemy.orm import Session
 
 from app.domain.models import AccessLog, Paste, PasteStatus
 from app.domain.state_machine import InvalidPasteStateTransition, validate_transition
-from app.observability import get_correlation_id
+from app.observability import log_extra
 
 
 logger = logging.getLogger(__name__)
 
+_STATUS_BY_NAME: dict[str, PasteStatus] = {status.value: status for status in PasteStatus}
+
+# Statuses the expiry sweep moves to EXPIRED in a single bulk UPDATE.
+_EXPIRABLE_STATUSES = (PasteStatus.ACTIVE, PasteStatus.VIEWED)
+
+# Statuses from which a paste may still be viewed.
+_VIEWABLE_STATUSES = (PasteStatus.ACTIVE, PasteStatus.VIEWED)
+
+# Transitions a successful view may apply in ``view_and_increment_atomic``.
+_VIEW_TRANSITIONS = (
+    (PasteStatus.ACTIVE, PasteStatus.VIEWED),
+    (PasteStatus.ACTIVE, PasteStatus.EXPIRED),
+    (PasteStatus.VIEWED, PasteStatus.EXPIRED),
+)
+
+# Hot-path statements are built once so each call reuses the same statement
+# object and hits the compiled-statement cache without rebuilding it.
+_SELECT_PASTE_BY_ID: Select[tuple[Paste]] = select(Paste).where(
+    Paste.id == bindparam("pid")
+)
+_INCREMENT_VIEW_COUNT: Update = (
+    update(Paste)
+    .where(Paste.id == bindparam("pid"))
+    .values(current_views=Paste.current_views + 1)
+    .returning(Paste.current_views)
+)
+
+# Columns returned by the view UPDATE; everything a paste DTO needs, but
+# never the password hash.
+_VIEW_RETURNING = (
+    Paste.id,
+    Paste.content,
+    Paste.max_views,
+    Paste.current_views,
+    Paste.expires_at,
+    Paste.status,
+    Paste.created_at,
+    Paste.updated_at,
+)
+
+# The transitions a view may apply are fixed, so check them once at import.
+for _current, _target in _VIEW_TRANSITIONS:
+    validate_transition(current_state=_current, next_state=_target)
+
+
+def _build_view_update(*, unprotected_only: bool) -> Update:
+    """
+    Guarded view UPDATE used by ``view_and_increment_atomic``; binds ``pid``
+    and ``now``.
+    """
+
+    conditions = [
+        Paste.id == bindparam("pid"),
+        Paste.status.in_(_VIEWABLE_STATUSES),
+        or_(Paste.expires_at.is_(None), Paste.expires_at > bindparam("now")),
+        Paste.current_views < Paste.max_views,
+    ]
+    if unprotected_only:
+        conditions.append(Paste.password_hash.is_(None))
+
+    status_type = Paste.status.type
+    return (
+        update(Paste)
+        .where(*conditions)
+        .values(
+            current_views=Paste.current_views + 1,
+            status=cast(
+                case(
+                    (
+                        Paste.current_views + 1 >= Paste.max_views,
+                        literal(PasteStatus.EXPIRED, status_type),
+                    ),
+                    else_=literal(PasteStatus.VIEWED, status_type),
+                ),
+                status_type,
+            ),
+        )
+        .returning(*_VIEW_RETURNING)
+        .execution_options(synchronize_session=False)
+    )
+
+
+_VIEW_UNPROTECTED = _build_view_update(unprotected_only=True)
+_VIEW_PASSWORD_VERIFIED = _build_view_update(unprotected_only=False)
+
+_ACCESS_LOG_COLUMNS = ("id", "paste_id", "ip_address", "success", "accessed_at")
+_COPY_ACCESS_LOGS = (
+    f"COPY access_logs ({', '.join(_ACCESS_LOG_COLUMNS)}) FROM STDIN"
+)
+
 
 class PasteRepository:
     """
@@ -33,30 +136,39 @@ class PasteRepository:
         max_views: int,
         expires_at: Optional[datetime] = None,
         password_hash: Optional[str] = None,
+        now: Optional[datetime] = None,
     ) -> Paste:
         """
         Create and persist a new Paste.
 
-        Note: Paste content is set only at creation time and is not exposed
-        for updates via this repository.
+        ``now`` stamps ``created_at``/``updated_at`` (defaults to the current
+        time). Note: Paste content is set only at creation time and is not
+        exposed for updates via this repository.
         """
 
+        # Populate the key and defaults client-side so the entity is complete
+        # without a flush; the caller's commit issues the single INSERT.
+        now = now or datetime.now(UTC)
         paste = Paste(
+            id=uuid.uuid4(),
             content=content,
             max_views=max_views,
+            current_views=0,
             expires_at=expires_at,
+            status=PasteStatus.ACTIVE,
             password_hash=password_hash,
+            created_at=now,
+            updated_at=now,
         )
         self._session.add(paste)
-        # Flush so that generated primary key and defaults are populated.
-        self._session.flush()
         return paste
 
     def get_paste_by_id(self, paste_id: uuid.UUID) -> Optional[Paste]:
         """Return a Paste by its id, or ``None`` if not found."""
 
-        stmt: Select[tuple[Paste]] = select(Paste).where(Paste.id == paste_id)
-        return self._session.execute(stmt).scalar_one_or_none()
+        return self._session.execute(
+            _SELECT_PASTE_BY_ID, {"pid": paste_id}
+        ).scalar_one_or_none()
 
     def increment_view_count_atomic(self, paste_id: uuid.UUID) -> int:
         """
@@ -66,13 +178,7 @@ class PasteRepository:
         Raises ``LookupError`` if no Paste with the given id exists.
         """
 
-        stmt: Update = (
-            update(Paste)
-            .where(Paste.id == paste_id)
-            .values(current_views=Paste.current_views + 1)
-            .returning(Paste.current_views)
-        )
-        result = self._session.execute(stmt)
+        result = self._session.execute(_INCREMENT_VIEW_COUNT, {"pid": paste_id})
         row = result.one_or_none()
         if row is None:
             raise LookupError(f"Paste with id {paste_id} not found.")
@@ -80,6 +186,36 @@ class PasteRepository:
         (new_count,) = row
         return int(new_count)
 
+    def view_and_increment_atomic(
+        self,
+        paste_id: uuid.UUID,
+        *,
+        now: datetime,
+        password_verified: bool = False,
+    ) -> Optional[RowMapping]:
+        """
+        Consume one view of a Paste with a single ``UPDATE ... RETURNING``.
+
+        The UPDATE only matches a paste that is viewable right now: status
+        ACTIVE or VIEWED, not past ``expires_at``, with views remaining, and
+        either unprotected or ``password_verified``. It increments
+        ``current_views`` and moves the paste to EXPIRED when the last allowed
+        view is consumed, otherwise to VIEWED.
+
+        Returns the updated row as a Core mapping (no ORM entity is loaded or
+        synchronized), or ``None`` when no row matched; the caller decides
+        whether the paste is missing or merely unavailable.
+        """
+
+        stmt = _VIEW_PASSWORD_VERIFIED if password_verified else _VIEW_UNPROTECTED
+
+        # Caller is responsible for committing.
+        return (
+            self._session.execute(stmt, {"pid": paste_id, "now": now})
+            .mappings()
+            .one_or_none()
+        )
+
     def update_status_via_state_machine(
         self,
         paste: Paste,
@@ -99,28 +235,71 @@ class PasteRepository:
         if isinstance(next_status, PasteStatus):
             paste.status = next_status
         else:
-            try:
-                paste.status = PasteStatus(next_status)
-            except ValueError as exc:  # Should normally be caught by validate_transition
+            status = _STATUS_BY_NAME.get(next_status)
+            if status is None:  # Should normally be caught by validate_transition
                 raise InvalidPasteStateTransition(
                     f"Unknown paste state {next_status!r}"
-                ) from exc
+                )
+            paste.status = status
+
+        # ``paste`` is already persistent in this session; dirty tracking picks
+        # up the attribute change, so no ``session.add`` is needed.
+
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Paste status transition",
+                extra=log_extra(
+                    "paste_status_transition",
+                    paste.id,
+                    status_from=current.value,
+                    status_to=paste.status.value,
+                ),
+            )
 
-        self._session.add(paste)
+        # Caller is responsible for committing.
+        return paste
+
+    def expire_overdue_pastes(self, now: datetime) -> list[uuid.UUID]:
+        """
+        Transition every ACTIVE/VIEWED Paste whose ``expires_at`` has passed
+        to EXPIRED with a single ``UPDATE ... RETURNING``.
 
-        logger.info(
-            "Paste status transition",
-            extra={
-                "event": "paste_status_transition",
-                "paste_id": str(paste.id),
-                "status_from": current.value,
-                "status_to": paste.status.value,
-                "correlation_id": get_correlation_id(),
-            },
+        Rows are never loaded as ORM entities, so the per-instance state
+        machine is bypassed; the WHERE clause only matches states that may
+        legally move to EXPIRED. Returns the ids of the expired pastes.
+        """
+
+        for status in _EXPIRABLE_STATUSES:
+            validate_transition(current_state=status, next_state=PasteStatus.EXPIRED)
+
+        stmt: Update = (
+            update(Paste)
+            .where(
+                Paste.status.in_(_EXPIRABLE_STATUSES),
+                Paste.expires_at.isnot(None),
+                Paste.expires_at < now,
+            )
+            .values(status=PasteStatus.EXPIRED, updated_at=now)
+            .returning(Paste.id)
+            .execution_options(synchronize_session=False)
         )
 
         # Caller is responsible for committing.
-        return paste
+        return list(self._session.execute(stmt).scalars().all())
+
+    def get_next_expiry(self) -> Optional[datetime]:
+        """
+        Return the earliest ``expires_at`` among pastes that can still expire,
+        or ``None`` if there are none.
+        """
+
+        stmt: Select[tuple[Optional[datetime]]] = select(
+            func.min(Paste.expires_at)
+        ).where(
+            Paste.status.in_(_EXPIRABLE_STATUSES),
+            Paste.expires_at.isnot(None),
+        )
+        return self._session.execute(stmt).scalar_one()
 
 
 class AccessLogRepository:
@@ -139,19 +318,60 @@ class AccessLogRepository:
         paste_id: uuid.UUID,
         ip_address: Optional[str],
         success: bool,
-        accessed_at: Optional[datetime] = None,
+        accessed_at: datetime,
     ) -> AccessLog:
         """
         Create and persist a new AccessLog entry for a Paste.
+
+        ``accessed_at`` is the instant of the view, as captured by the caller.
         """
 
         log = AccessLog(
+            id=uuid.uuid4(),
             paste_id=paste_id,
             ip_address=ip_address,
             success=success,
-            accessed_at=accessed_at or datetime.now(UTC),
+            accessed_at=accessed_at,
         )
         self._session.add(log)
-        self._session.flush()
         return log
 
+    def bulk_create_access_logs(self, rows: list[dict[str, Any]]) -> None:
+        """
+        Insert many AccessLog rows in one round trip.
+
+        Each row maps column names to values; ``id``, ``accessed_at`` and
+        ``success`` are filled in client-side when missing. On psycopg the
+        rows are streamed with ``COPY ... FROM STDIN``; other drivers get a
+        single executemany INSERT. Rows bypass the unit of work, so no
+        AccessLog entities are returned.
+        """
+
+        if not rows:
+            return
+
+        now = datetime.now(UTC)
+        values = [
+            (
+                row.get("id") or uuid.uuid4(),
+                row["paste_id"],
+                row.get("ip_address"),
+                row.get("success", True),
+                row.get("accessed_at") or now,
+            )
+            for row in rows
+        ]
+
+        connection = self._session.connection()
+        if connection.dialect.driver == "psycopg":
+            # Runs on the session's connection, inside its transaction.
+            with connection.connection.driver_connection.cursor() as cursor:
+                with cursor.copy(_COPY_ACCESS_LOGS) as copy:
+                    for value in values:
+                        copy.write_row(value)
+            return
+
+        self._session.execute(
+            insert(AccessLog.__table__),
+            [dict(zip(_ACCESS_LOG_COLUMNS, value)) for value in values],
+        )
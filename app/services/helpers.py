@@ -1,6 +1,16 @@
 from __future__ import annotations
 import bcrypt
 import hashlib
+import hmac
+import uuid
+
+from itsdangerous import BadSignature, TimestampSigner
+
+
+# How long a view token issued after a successful password check stays valid.
+VIEW_TOKEN_MAX_AGE_SECONDS = 60
+
+_VIEW_TOKEN_SALT = "paste-view-token"
 
 
 def _prehash(password: str) -> bytes:
@@ -18,3 +28,33 @@ def verify_password(plain: str, hashed: str) -> bool:
         _prehash(plain),
         hashed.encode("utf-8")
     )
+
+
+def _view_token_value(paste_id: uuid.UUID, password_hash: str) -> str:
+    # Binding the token to the stored hash means a changed password
+    # invalidates every token issued for the old one.
+    credential = hashlib.sha256(password_hash.encode("utf-8")).hexdigest()[:32]
+    return f"{paste_id}:{credential}"
+
+
+def sign_view_token(paste_id: uuid.UUID, password_hash: str, secret_key: str) -> str:
+    signer = TimestampSigner(secret_key, salt=_VIEW_TOKEN_SALT)
+    return signer.sign(_view_token_value(paste_id, password_hash)).decode("utf-8")
+
+
+def verify_view_token(
+    token: str,
+    paste_id: uuid.UUID,
+    password_hash: str,
+    secret_key: str,
+    max_age: int = VIEW_TOKEN_MAX_AGE_SECONDS,
+) -> bool:
+    # Lets clients that already proved the password skip bcrypt on re-views.
+    signer = TimestampSigner(secret_key, salt=_VIEW_TOKEN_SALT)
+    try:
+        value = signer.unsign(token, max_age=max_age)
+    except BadSignature:  # also covers SignatureExpired
+        return False
+    return hmac.compare_digest(
+        value.decode("utf-8"), _view_token_value(paste_id, password_hash)
+    )
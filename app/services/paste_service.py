@@ -1,38 +1,61 @@
 from __future__ import annotations
 
 import logging
+import operator
+import threading
 import uuid
-from collections.abc import Callable
+from collections.abc import Callable, Mapping
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Any, Optional
 
+from cachetools import TTLCache
 from sqlalchemy.orm import Session
-from app.services.helpers import hash_password, verify_password
+from app.services.helpers import (
+    hash_password,
+    sign_view_token,
+    verify_password,
+    verify_view_token,
+)
 
 from app.domain.models import Paste, PasteStatus
-from app.observability import get_correlation_id
+from app.observability import log_extra
 from app.repositories.paste_repository import (
     AccessLogRepository,
     PasteRepository,
 )
+from app.worker.access_log_buffer import AccessLogBuffer
 
 
 logger = logging.getLogger(__name__)
 
 
+_DTO_FIELDS = (
+    "id",
+    "content",
+    "max_views",
+    "current_views",
+    "expires_at",
+    "status",
+    "created_at",
+    "updated_at",
+)
+_get_dto_fields = operator.attrgetter(*_DTO_FIELDS)
+_STATUS_VALUES = {status: status.value for status in PasteStatus}
+
+
 def _paste_to_dto(paste: Paste) -> dict[str, Any]:
     """Convert a Paste ORM entity to a plain dict DTO. Status as string value."""
-    return {
-        "id": paste.id,
-        "content": paste.content,
-        "max_views": paste.max_views,
-        "current_views": paste.current_views,
-        "expires_at": paste.expires_at,
-        "status": paste.status.value,
-        "created_at": paste.created_at,
-        "updated_at": paste.updated_at,
-    }
+    dto = dict(zip(_DTO_FIELDS, _get_dto_fields(paste)))
+    dto["status"] = _STATUS_VALUES[paste.status]
+    return dto
+
+
+def _row_to_dto(row: Mapping[str, Any]) -> dict[str, Any]:
+    """Convert a Core row mapping of paste columns to the same DTO shape."""
+    dto = dict(row)
+    dto["status"] = _STATUS_VALUES[dto["status"]]
+    return dto
 
 
 class PasteError(Exception):
@@ -53,18 +76,60 @@ class PasteUnavailableError(PasteError):
 
 MAX_CONTENT_BYTES = 10 * 1024  # 10 KiB
 
+# EXPIRED/DELETED are terminal, so a paste seen in one of them can be rejected
+# without touching the database. Only pastes without a password are cached,
+# so protected pastes keep answering "password required" first.
+_TERMINAL_CACHE: TTLCache[uuid.UUID, str] = TTLCache(maxsize=10_000, ttl=60)
+_terminal_cache_lock = threading.Lock()
+_terminal_cache_counters = {"hits": 0, "misses": 0}
+
+
+def _remember_terminal(paste_id: uuid.UUID, status: PasteStatus) -> None:
+    with _terminal_cache_lock:
+        _TERMINAL_CACHE[paste_id] = _STATUS_VALUES[status]
+
+
+def _cached_terminal_status(paste_id: uuid.UUID) -> Optional[str]:
+    with _terminal_cache_lock:
+        status = _TERMINAL_CACHE.get(paste_id)
+        _terminal_cache_counters["hits" if status is not None else "misses"] += 1
+        return status
+
+
+def _clear_terminal_cache() -> None:
+    """Forget every cached terminal status and reset the counters (tests)."""
+    with _terminal_cache_lock:
+        _TERMINAL_CACHE.clear()
+        _terminal_cache_counters.update(hits=0, misses=0)
+
+
+def terminal_cache_stats() -> dict[str, int]:
+    """Return hit/miss counters and current size of the terminal-paste cache."""
+    with _terminal_cache_lock:
+        return {
+            **_terminal_cache_counters,
+            "size": len(_TERMINAL_CACHE),
+            "maxsize": int(_TERMINAL_CACHE.maxsize),
+        }
+
 
 @dataclass
 class PasteService:
     """
     Application service coordinating paste-related use cases.
 
-    Owns session lifecycle: creates a session per use case, commits on success,
-    rolls back on exception, and closes the session in a finally block.
+    Owns transaction boundaries: commits on success and rolls back on
+    exception. ``session_factory`` is expected to be a ``scoped_session``
+    whose session is removed by the app at request teardown, so the service
+    does not close it.
     Returns plain dict DTOs; no ORM entities escape this layer.
+
+    When ``access_log_buffer`` is running, successful views enqueue their
+    AccessLog row for a batched INSERT instead of writing it inline.
     """
 
     session_factory: Callable[[], Session]
+    access_log_buffer: Optional[AccessLogBuffer] = None
 
     # -------------------------------------------------------------------------
     # Creation
@@ -84,24 +149,29 @@ class PasteService:
         - ``expires_at`` (if provided) must be in the future
         - ``content`` size must be <= 10 KiB (UTF-8 bytes)
         """
+        # One instant for the whole use case: expiry validation and timestamps.
+        now_utc = datetime.now(timezone.utc)
+
         if max_views < 1:
             logger.warning(
                 "Invalid max_views when creating paste",
-                extra={
-                    "event": "paste_create_invalid_parameters",
-                    "correlation_id": get_correlation_id(),
-                },
+                extra=log_extra("paste_create_invalid_parameters"),
             )
             raise InvalidPasteParameters("max_views must be >= 1.")
 
-        encoded = content.encode("utf-8")
-        if len(encoded) > MAX_CONTENT_BYTES:
+        # A UTF-8 character takes 1-4 bytes, so the character count bounds the
+        # encoded size; only encode when those bounds are inconclusive.
+        length = len(content)
+        if length <= MAX_CONTENT_BYTES // 4:
+            too_large = False
+        elif length > MAX_CONTENT_BYTES:
+            too_large = True
+        else:
+            too_large = len(content.encode("utf-8")) > MAX_CONTENT_BYTES
+        if too_large:
             logger.warning(
                 "Content too large when creating paste",
-                extra={
-                    "event": "paste_create_invalid_parameters",
-                    "correlation_id": get_correlation_id(),
-                },
+                extra=log_extra("paste_create_invalid_parameters"),
             )
             raise InvalidPasteParameters(
                 f"content must be at most {MAX_CONTENT_BYTES} bytes when UTF-8 encoded."
@@ -112,23 +182,16 @@ class PasteService:
             if expires_at.tzinfo is None:
                 logger.warning(
                     "Naive expires_at when creating paste",
-                    extra={
-                        "event": "paste_create_invalid_parameters",
-                        "correlation_id": get_correlation_id(),
-                    },
+                    extra=log_extra("paste_create_invalid_parameters"),
                 )
                 raise InvalidPasteParameters(
                     "expires_at must be a timezone-aware datetime (UTC recommended)."
                 )
 
-            now_utc = datetime.now(timezone.utc)
             if expires_at <= now_utc:
                 logger.warning(
                     "Past expires_at when creating paste",
-                    extra={
-                        "event": "paste_create_invalid_parameters",
-                        "correlation_id": get_correlation_id(),
-                    },
+                    extra=log_extra("paste_create_invalid_parameters"),
                 )
                 raise InvalidPasteParameters("expires_at must be in the future.")
 
@@ -144,22 +207,18 @@ class PasteService:
                 max_views=max_views,
                 expires_at=expires_at,
                 password_hash=password_hash,
+                now=now_utc,
             )
-            logger.info(
-                "Paste created",
-                extra={
-                    "event": "paste_created",
-                    "paste_id": str(paste.id),
-                    "correlation_id": get_correlation_id(),
-                },
-            )
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "Paste created",
+                    extra=log_extra("paste_created", paste.id),
+                )
             session.commit()
             return _paste_to_dto(paste)
         except Exception:
             session.rollback()
             raise
-        finally:
-            session.close()
 
     # -------------------------------------------------------------------------
     # Deletion
@@ -186,21 +245,18 @@ class PasteService:
                 paste,
                 PasteStatus.DELETED,
             )
-            logger.info(
-                "Paste deleted",
-                extra={
-                    "event": "paste_deleted",
-                    "paste_id": str(paste.id),
-                    "correlation_id": get_correlation_id(),
-                },
-            )
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "Paste deleted",
+                    extra=log_extra("paste_deleted", paste.id),
+                )
             session.commit()
-            return {"id": str(paste.id), "status": paste.status.value}
+            if not paste.password_hash:
+                _remember_terminal(paste.id, PasteStatus.DELETED)
+            return {"id": str(paste.id), "status": _STATUS_VALUES[paste.status]}
         except Exception:
             session.rollback()
             raise
-        finally:
-            session.close()
 
     # -------------------------------------------------------------------------
     # Retrieval / viewing
@@ -211,158 +267,191 @@ class PasteService:
         *,
         ip_address: Optional[str] = None,
         provided_password: Optional[str] = None,
+        password_verified: bool = False,
+        view_token: Optional[str] = None,
+        secret_key: Optional[str] = None,
     ) -> dict[str, Any]:
         """
         Retrieve a paste for viewing, enforcing view and expiry rules.
 
+        ``password_verified`` skips the password check for trusted callers
+        that have already proven knowledge of the password.
+
+        With a ``secret_key``, a successful password check adds a signed
+        ``view_token`` to the returned DTO; presenting it as ``view_token``
+        on a later view skips the (deliberately slow) bcrypt check. Tokens
+        are bound to the paste's current password hash.
+
         Rules:
         - If status is EXPIRED or DELETED → raise PasteUnavailableError
         - If expires_at < now → transition to EXPIRED and raise PasteUnavailableError
         - If current_views >= max_views → transition to EXPIRED and raise PasteUnavailableError
         - Otherwise:
-          - increment view count atomically
-          - if current_views reaches max_views → transition to VIEWED or EXPIRED
+          - increment view count and apply the status transition in one
+            atomic UPDATE (VIEWED, or EXPIRED on the last allowed view)
           - log access
+
+        Unprotected pastes already known to be EXPIRED or DELETED are rejected
+        from an in-process cache without opening a session.
         """
+        # One instant for the whole use case: expiry checks, the view UPDATE
+        # guard and the access log timestamp.
+        now_utc = datetime.now(timezone.utc)
+
+        cached_status = _cached_terminal_status(paste_id)
+        if cached_status is not None:
+            raise PasteUnavailableError(
+                f"Paste {paste_id} is not available (status={cached_status})."
+            )
+
         session = self.session_factory()
         try:
             paste_repo = PasteRepository(session=session)
             access_log_repo = AccessLogRepository(session=session)
 
-            logger.info(
-                "Paste access attempt",
-                extra={
-                    "event": "paste_access_attempt",
-                    "paste_id": str(paste_id),
-                    "correlation_id": get_correlation_id(),
-                },
-            )
-
-            paste = paste_repo.get_paste_by_id(paste_id)
-            if paste is None:
-                raise PasteNotFoundError(f"Paste with id {paste_id} not found.")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "Paste access attempt",
+                    extra=log_extra("paste_access_attempt", paste_id),
+                )
 
-            # 🔒 Password validation
-            if paste.password_hash:
-                if not provided_password:
-                    raise PermissionError("Password required")
+            # Fast path: a viewable paste that needs no password check is
+            # consumed by a single guarded UPDATE ... RETURNING. Unless the
+            # caller vouched for the password, a match means no password.
+            # A view token is only useful for a protected paste, so go
+            # straight to the lookup that can check it.
+            protected = password_verified
+            issue_token = False
+            viewed = None
+            if password_verified or view_token is None:
+                viewed = paste_repo.view_and_increment_atomic(
+                    paste_id,
+                    now=now_utc,
+                    password_verified=password_verified,
+                )
 
-                if not verify_password(provided_password, paste.password_hash):
-                    raise PermissionError("Invalid password")
+            if viewed is None:
+                # The guarded UPDATE did not match; load the row once to find
+                # out why.
+                paste = paste_repo.get_paste_by_id(paste_id)
+                if paste is None:
+                    raise PasteNotFoundError(f"Paste with id {paste_id} not found.")
+                protected = bool(paste.password_hash)
+
+                # 🔒 Password validation
+                if paste.password_hash and not password_verified:
+                    token_valid = bool(view_token and secret_key) and verify_view_token(
+                        view_token, paste.id, paste.password_hash, secret_key
+                    )
+                    if not token_valid:
+                        if not provided_password:
+                            raise PermissionError("Password required")
 
-            now_utc = datetime.now(timezone.utc)
+                        if not verify_password(provided_password, paste.password_hash):
+                            raise PermissionError("Invalid password")
 
-            # Immediate rejection based on status.
-            if paste.status in (PasteStatus.EXPIRED, PasteStatus.DELETED):
-                raise PasteUnavailableError(
-                    f"Paste {paste.id} is not available (status={paste.status.value})."
-                )
+                        issue_token = secret_key is not None
 
-            # Time-based expiry.
-            if paste.expires_at is not None:
-                expires_at = paste.expires_at
-                if expires_at.tzinfo is None:
-                    # Assume UTC for stored naive datetimes.
-                    expires_at = expires_at.replace(tzinfo=timezone.utc)
+                # Immediate rejection based on status.
+                if paste.status in (PasteStatus.EXPIRED, PasteStatus.DELETED):
+                    if not protected:
+                        _remember_terminal(paste.id, paste.status)
+                    raise PasteUnavailableError(
+                        f"Paste {paste.id} is not available (status={paste.status.value})."
+                    )
 
-                if expires_at <= now_utc:
+                # Time-based expiry.
+                if paste.expires_at is not None:
+                    expires_at = paste.expires_at
+                    if expires_at.tzinfo is None:
+                        # Assume UTC for stored naive datetimes.
+                        expires_at = expires_at.replace(tzinfo=timezone.utc)
+
+                    if expires_at <= now_utc:
+                        paste_repo.update_status_via_state_machine(
+                            paste,
+                            PasteStatus.EXPIRED,
+                        )
+                        session.commit()
+                        if not protected:
+                            _remember_terminal(paste.id, PasteStatus.EXPIRED)
+                        if logger.isEnabledFor(logging.INFO):
+                            logger.info(
+                                "Paste expired due to time",
+                                extra=log_extra("paste_auto_expired", paste.id),
+                            )
+                        raise PasteUnavailableError(f"Paste {paste.id} has expired.")
+
+                # View-count-based expiry prior to serving this view.
+                if paste.current_views >= paste.max_views:
                     paste_repo.update_status_via_state_machine(
                         paste,
                         PasteStatus.EXPIRED,
                     )
-                    logger.info(
-                        "Paste expired due to time",
-                        extra={
-                            "event": "paste_auto_expired",
-                            "paste_id": str(paste.id),
-                            "correlation_id": get_correlation_id(),
-                        },
+                    session.commit()
+                    if not protected:
+                        _remember_terminal(paste.id, PasteStatus.EXPIRED)
+                    if logger.isEnabledFor(logging.INFO):
+                        logger.info(
+                            "Paste expired due to max views reached before access",
+                            extra=log_extra("paste_auto_expired", paste.id),
+                        )
+                    raise PasteUnavailableError(
+                        f"Paste {paste.id} has reached its view limit."
                     )
-                    raise PasteUnavailableError(f"Paste {paste.id} has expired.")
-
-            # View-count-based expiry prior to serving this view.
-            if paste.current_views >= paste.max_views:
-                paste_repo.update_status_via_state_machine(
-                    paste,
-                    PasteStatus.EXPIRED,
-                )
-                logger.info(
-                    "Paste expired due to max views reached before access",
-                    extra={
-                        "event": "paste_auto_expired",
-                        "paste_id": str(paste.id),
-                        "correlation_id": get_correlation_id(),
-                    },
-                )
-                raise PasteUnavailableError(
-                    f"Paste {paste.id} has reached its view limit."
-                )
 
-            # At this point, the paste is eligible to be viewed. We now:
-            # - increment view count atomically
-            # - possibly transition status
-            # - log access
-            new_views = paste_repo.increment_view_count_atomic(paste.id)
-
-            # Re-load the paste so that the caller gets up-to-date state.
-            updated = paste_repo.get_paste_by_id(paste.id)
-            if updated is None:
-                # Highly unlikely under normal operation, but being defensive.
-                raise PasteNotFoundError(
-                    f"Paste with id {paste_id} disappeared during view operation."
+                # The password was just verified; consume the view.
+                viewed = paste_repo.view_and_increment_atomic(
+                    paste_id,
+                    now=now_utc,
+                    password_verified=True,
                 )
-
-            # Decide status transitions based on the new view count.
-            #
-            # We use the allowed transitions:
-            #   ACTIVE → VIEWED
-            #   ACTIVE → EXPIRED
-            #   VIEWED → EXPIRED
-            #
-            # Semantics:
-            # - First successful view from ACTIVE moves to VIEWED (if views remain).
-            # - When the last allowed view is consumed, the paste moves to EXPIRED.
-            if updated.status == PasteStatus.ACTIVE:
-                if new_views < updated.max_views:
-                    # First successful view: mark as VIEWED.
-                    paste_repo.update_status_via_state_machine(
-                        updated,
-                        PasteStatus.VIEWED,
-                    )
-                else:
-                    # Last allowed view consumed: expire immediately.
-                    paste_repo.update_status_via_state_machine(
-                        updated,
-                        PasteStatus.EXPIRED,
-                    )
-            elif updated.status == PasteStatus.VIEWED:
-                if new_views >= updated.max_views:
-                    paste_repo.update_status_via_state_machine(
-                        updated,
-                        PasteStatus.EXPIRED,
+                if viewed is None:
+                    # A concurrent view consumed the last allowed view.
+                    raise PasteUnavailableError(
+                        f"Paste {paste_id} has reached its view limit."
                     )
 
-            # Log successful access.
-            access_log_repo.create_access_log(
-                paste_id=updated.id,
-                ip_address=ip_address,
-                success=True,
+            # Log successful access. A buffered row is only queued once the
+            # view has committed, so a failed commit never logs a view.
+            buffered = (
+                self.access_log_buffer is not None and self.access_log_buffer.is_running
             )
+            if not buffered:
+                access_log_repo.create_access_log(
+                    paste_id=paste_id,
+                    ip_address=ip_address,
+                    success=True,
+                    accessed_at=now_utc,
+                )
 
-            logger.info(
-                "Paste access successful",
-                extra={
-                    "event": "paste_access_success",
-                    "paste_id": str(updated.id),
-                    "correlation_id": get_correlation_id(),
-                },
-            )
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "Paste access successful",
+                    extra=log_extra(
+                        "paste_access_success",
+                        paste_id,
+                        status_to=_STATUS_VALUES[viewed["status"]],
+                    ),
+                )
             session.commit()
-            return _paste_to_dto(updated)
+            if buffered:
+                self.access_log_buffer.enqueue(
+                    {
+                        "paste_id": paste_id,
+                        "ip_address": ip_address,
+                        "success": True,
+                        "accessed_at": now_utc,
+                    }
+                )
+            if viewed["status"] is PasteStatus.EXPIRED and not protected:
+                _remember_terminal(paste_id, PasteStatus.EXPIRED)
+            dto = _row_to_dto(viewed)
+            if issue_token:
+                dto["view_token"] = sign_view_token(paste_id, paste.password_hash, secret_key)
+            return dto
         except Exception:
             session.rollback()
             raise
-        finally:
-            session.close()
 
 
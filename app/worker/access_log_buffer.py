@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from typing import Any
+
+from flask import Flask
+from sqlalchemy.orm import Session
+
+from app.db import SessionLocal
+from app.repositories.paste_repository import AccessLogRepository
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 256
+DEFAULT_BATCH_MS = 50
+
+# Rows held in memory at most; beyond this new rows are dropped (and logged)
+# rather than letting a stalled database grow the process without bound.
+MAX_PENDING_BATCHES = 40
+
+# A batch that fails this many writes in a row is dropped (and logged), so a
+# bad row cannot block every row queued behind it.
+MAX_FLUSH_ATTEMPTS = 5
+
+# While writes keep failing the flush interval doubles up to this cap, and
+# failure tracebacks are logged at most once per FAILURE_LOG_INTERVAL.
+MAX_BACKOFF_SECONDS = 30.0
+FAILURE_LOG_INTERVAL = 30.0
+
+
+class AccessLogBuffer:
+    """
+    Process-level buffer that coalesces AccessLog rows into batched INSERTs.
+
+    ``enqueue`` only appends to an in-memory deque; a background thread
+    flushes up to ``batch_size`` rows per INSERT whenever a full batch is
+    pending or ``flush_interval`` seconds have passed.
+    """
+
+    def __init__(
+        self,
+        *,
+        session_factory: Callable[[], Session] = SessionLocal,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_BATCH_MS / 1000,
+    ) -> None:
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._session_factory = session_factory
+        self._rows: deque[dict[str, Any]] = deque()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._atexit_registered = False
+        self._init_flush_state()
+
+    def _init_flush_state(self) -> None:
+        # Serializes flushes (flusher thread vs. the atexit hook).
+        self._flush_lock = threading.Lock()
+        # The batch whose last write failed; retried before any new rows.
+        self._retry_batch: list[dict[str, Any]] = []
+        self._batch_attempts = 0
+        self._consecutive_failures = 0
+        self._last_failure_log = float("-inf")
+
+    @property
+    def is_running(self) -> bool:
+        # A thread inherited across fork() (e.g. gunicorn --preload) is dead.
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def pending(self) -> int:
+        """Number of rows waiting for the next flush."""
+
+        with self._lock:
+            return len(self._rows) + len(self._retry_batch)
+
+    def enqueue(self, row: dict[str, Any]) -> None:
+        """Queue one AccessLog row (column name → value) for the next flush."""
+
+        with self._lock:
+            if len(self._rows) + len(self._retry_batch) >= self.batch_size * MAX_PENDING_BATCHES:
+                logger.warning(
+                    "Access log buffer full; dropping row",
+                    extra={"event": "access_log_buffer_full"},
+                )
+                return
+            self._rows.append(row)
+            pending = len(self._rows)
+
+        if pending >= self.batch_size:
+            self._wakeup.set()
+
+    def flush(self) -> int:
+        """
+        Write every pending row in batches of ``batch_size``; returns the count.
+
+        A failed batch is kept aside and retried on the next flush, ahead of
+        newer rows; after ``MAX_FLUSH_ATTEMPTS`` failed writes it is dropped.
+        Flushing stops at the first failure.
+        """
+
+        written = 0
+        with self._flush_lock:
+            while True:
+                with self._lock:
+                    if self._retry_batch:
+                        batch, self._retry_batch = self._retry_batch, []
+                    else:
+                        count = min(len(self._rows), self.batch_size)
+                        batch = [self._rows.popleft() for _ in range(count)]
+                if not batch:
+                    return written
+
+                if self._write(batch):
+                    written += len(batch)
+                    self._batch_attempts = 0
+                    self._consecutive_failures = 0
+                    continue
+
+                self._batch_attempts += 1
+                self._consecutive_failures += 1
+                if self._batch_attempts >= MAX_FLUSH_ATTEMPTS:
+                    logger.error(
+                        "Dropping access log batch after repeated failures",
+                        extra={
+                            "event": "access_log_batch_dropped",
+                            "dropped": len(batch),
+                            "attempts": self._batch_attempts,
+                        },
+                    )
+                    self._batch_attempts = 0
+                else:
+                    with self._lock:
+                        self._retry_batch = batch
+                return written
+
+    def _write(self, batch: list[dict[str, Any]]) -> bool:
+        session = self._session_factory()
+        try:
+            AccessLogRepository(session=session).bulk_create_access_logs(batch)
+            session.commit()
+            return True
+        except Exception:
+            session.rollback()
+            now = time.monotonic()
+            if now - self._last_failure_log >= FAILURE_LOG_INTERVAL:
+                self._last_failure_log = now
+                logger.exception(
+                    "Failed to flush access logs",
+                    extra={
+                        "event": "access_log_flush_failed",
+                        "rows": len(batch),
+                        "consecutive_failures": self._consecutive_failures + 1,
+                    },
+                )
+            return False
+        finally:
+            session.close()
+
+    def _next_delay(self) -> float:
+        if not self._consecutive_failures:
+            return self.flush_interval
+        return min(
+            self.flush_interval * 2**self._consecutive_failures,
+            MAX_BACKOFF_SECONDS,
+        )
+
+    def start(self, app: Flask) -> None:
+        """Configure the buffer from ``app.config`` and start its flusher thread."""
+
+        self.batch_size = app.config.get("ACCESS_LOG_BATCH_SIZE", DEFAULT_BATCH_SIZE)
+        self.flush_interval = app.config.get("ACCESS_LOG_BATCH_MS", DEFAULT_BATCH_MS) / 1000
+
+        self._thread = threading.Thread(
+            target=self._flush_loop,
+            name="access-log-flusher",
+            daemon=True,
+        )
+        self._thread.start()
+        if not self._atexit_registered:
+            # Daemon threads are killed at exit; write whatever is still pending.
+            atexit.register(self.flush)
+            self._atexit_registered = True
+
+    def _reset_after_fork(self) -> None:
+        # Only the calling thread survives fork(): the lock may have been
+        # held by the flusher, and pending rows belong to the parent.
+        self._rows = deque()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._init_flush_state()
+
+    def _flush_loop(self) -> None:
+        while True:
+            if self._consecutive_failures:
+                # Backing off: a full batch must not cut the wait short.
+                time.sleep(self._next_delay())
+            else:
+                self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+
+access_log_buffer = AccessLogBuffer()
+
+_buffer_lock = threading.Lock()
+
+
+def _reset_buffer_after_fork() -> None:
+    global _buffer_lock
+    _buffer_lock = threading.Lock()
+    access_log_buffer._reset_after_fork()
+
+
+os.register_at_fork(after_in_child=_reset_buffer_after_fork)
+
+
+def start_access_log_buffer(app: Flask) -> None:
+    """
+    Start the process-wide access log buffer.
+
+    This function is idempotent and will only start a single flusher thread
+    per process; in a forked child (e.g. a preloaded gunicorn worker) it
+    starts a new one.
+    """
+
+    if access_log_buffer.is_running:
+        return
+
+    with _buffer_lock:
+        if access_log_buffer.is_running:
+            return
+        access_log_buffer.start(app)
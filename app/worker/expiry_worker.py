@@ -1,17 +1,18 @@
 from __future__ import annotations
 
+import atexit
 import logging
 import threading
 import time
 from datetime import datetime, timezone
-from typing import NoReturn
+from typing import Any, NoReturn
 
 from flask import Flask
-from sqlalchemy import Select, select, inspect
+from sqlalchemy import inspect
+from sqlalchemy.engine import Engine
 from sqlalchemy.exc import ProgrammingError
 
 from app.db import SessionLocal
-from app.domain.models import Paste, PasteStatus
 from app.observability import get_correlation_id
 from app.repositories.paste_repository import PasteRepository
 
@@ -20,28 +21,133 @@ logger = logging.getLogger(__name__)
 
 POLL_INTERVAL_SECONDS = 10.0
 
+# With LISTEN/NOTIFY available the worker sleeps until the next known expiry;
+# this only bounds the wait in case a notification is missed.
+MAX_IDLE_SECONDS = 300.0
+
+# Channel notified by the ``notify_paste_expiry_changed`` trigger whenever a
+# paste with an ``expires_at`` is inserted or its expiry changes.
+EXPIRY_CHANNEL = "paste_expiry_changed"
+
 _worker_started = False
 _worker_lock = threading.Lock()
 
 
+def _open_listener(engine: Engine) -> Any | None:
+    """
+    Open a dedicated autocommit psycopg connection that LISTENs on
+    ``EXPIRY_CHANNEL``.
+
+    Returns ``None`` when the engine is not backed by psycopg 3 (or the
+    connection fails), in which case the worker falls back to polling.
+    """
+
+    if engine.dialect.driver != "psycopg":
+        return None
+
+    try:
+        raw = engine.raw_connection()
+        connection = raw.driver_connection
+        # The listener lives for the whole worker; keep it out of the pool.
+        raw.detach()
+        connection.autocommit = True
+        connection.execute(f"LISTEN {EXPIRY_CHANNEL}")
+    except Exception:
+        logger.warning(
+            "Expiry worker: could not LISTEN for expiry changes; polling instead",
+            exc_info=True,
+            extra={
+                "event": "expiry_worker_listen_error",
+                "correlation_id": get_correlation_id() or "expiry-worker",
+            },
+        )
+        return None
+    return connection
+
+
+def _wait_for_next_cycle(listener: Any | None, timeout: float) -> Any | None:
+    """
+    Block for up to ``timeout`` seconds, returning early when an expiry change
+    is notified. Returns the listener to use for the next wait (``None`` if it
+    was lost).
+    """
+
+    if listener is None:
+        time.sleep(timeout)
+        return None
+
+    try:
+        for _notify in listener.notifies(timeout=timeout, stop_after=1):
+            pass
+    except Exception:
+        logger.warning(
+            "Expiry worker: lost LISTEN connection",
+            exc_info=True,
+            extra={
+                "event": "expiry_worker_listen_error",
+                "correlation_id": get_correlation_id() or "expiry-worker",
+            },
+        )
+        listener.close()
+        return None
+    return listener
+
+
+def _seconds_until(next_expiry: datetime | None, max_seconds: float) -> float:
+    """Return how long to wait for ``next_expiry``, capped at ``max_seconds``."""
+
+    if next_expiry is None:
+        return max_seconds
+    if next_expiry.tzinfo is None:
+        # Assume UTC for stored naive datetimes.
+        next_expiry = next_expiry.replace(tzinfo=timezone.utc)
+    remaining = (next_expiry - datetime.now(timezone.utc)).total_seconds()
+    return min(max(remaining, 0.0), max_seconds)
+
+
 def _expiry_loop(app: Flask) -> NoReturn:
-    """Background loop that periodically expires pastes."""
+    """
+    Background loop that expires pastes.
+
+    After each sweep the worker sleeps until the earliest pending expiry. On
+    PostgreSQL (psycopg 3) it also LISTENs on ``EXPIRY_CHANNEL`` so a newly
+    created paste with an earlier expiry wakes it up; other backends poll
+    every ``POLL_INTERVAL_SECONDS``.
+    """
+
+    # Once the table has been seen it is not looked up again; a later
+    # ProgrammingError (e.g. the schema was dropped) resets this flag.
+    schema_ready = False
 
     with app.app_context():
+        correlation_id = get_correlation_id() or "expiry-worker"
+
+        # One session for the lifetime of the worker thread; it is only
+        # closed at interpreter shutdown.
+        session = SessionLocal()
+        atexit.register(session.close)
+        listener = None
+
         while True:
-            session = SessionLocal()
+            # Drop identity-map state left over from the previous cycle.
+            session.expire_all()
+            if listener is None:
+                listener = _open_listener(session.get_bind())
+            max_wait = POLL_INTERVAL_SECONDS if listener is None else MAX_IDLE_SECONDS
+            next_expiry = None
             try:
                 # If tables haven't been created yet (no migrations run)
-                bind = session.get_bind()
-                inspector = inspect(bind)
-                if not inspector.has_table("pastes"):
-                    logger.info(
-                        "Expiry worker: 'pastes' table not found; skipping cycle",
-                        extra={
-                            "event": "expiry_worker_no_table",
-                            "correlation_id": get_correlation_id() or "expiry-worker",
-                        },
-                    )
+                if not schema_ready:
+                    schema_ready = inspect(session.get_bind()).has_table("pastes")
+                if not schema_ready:
+                    if logger.isEnabledFor(logging.INFO):
+                        logger.info(
+                            "Expiry worker: 'pastes' table not found; skipping cycle",
+                            extra={
+                                "event": "expiry_worker_no_table",
+                                "correlation_id": correlation_id,
+                            },
+                        )
                     session.rollback()
                     time.sleep(POLL_INTERVAL_SECONDS)
                     continue
@@ -49,52 +155,48 @@ def _expiry_loop(app: Flask) -> NoReturn:
                 now_utc = datetime.now(timezone.utc)
 
                 repo = PasteRepository(session=session)
-
-                stmt: Select[Paste] = select(Paste).where(
-                    Paste.status.in_([PasteStatus.ACTIVE, PasteStatus.VIEWED]),
-                    Paste.expires_at.isnot(None),
-                    Paste.expires_at < now_utc,
-                )
-
-                pastes = session.execute(stmt).scalars().all()
-                for paste in pastes:
-                    repo.update_status_via_state_machine(
-                        paste,
-                        PasteStatus.EXPIRED,
-                    )
-                    logger.info(
-                        "Expiry worker: transitioned paste to EXPIRED",
-                        extra={
-                            "event": "expiry_worker_transition",
-                            "paste_id": str(paste.id),
-                            "correlation_id": get_correlation_id() or "expiry-worker",
-                        },
-                    )
-
+                expired_ids = repo.expire_overdue_pastes(now_utc)
+
+                if expired_ids and logger.isEnabledFor(logging.INFO):
+                    for paste_id in expired_ids:
+                        logger.info(
+                            "Expiry worker: transitioned paste to EXPIRED",
+                            extra={
+                                "event": "expiry_worker_transition",
+                                "paste_id": str(paste_id),
+                                "correlation_id": correlation_id,
+                            },
+                        )
+
+                next_expiry = repo.get_next_expiry()
                 session.commit()
             except ProgrammingError:
                 # If the table goes missing for some reason, avoid noisy stack traces.
                 session.rollback()
+                schema_ready = False
+                max_wait = POLL_INTERVAL_SECONDS
                 logger.warning(
                     "Expiry worker: database schema not ready; skipping cycle",
                     extra={
                         "event": "expiry_worker_schema_error",
-                        "correlation_id": get_correlation_id() or "expiry-worker",
+                        "correlation_id": correlation_id,
                     },
                 )
             except Exception:  # pragma: no cover - defensive logging
                 session.rollback()
+                max_wait = POLL_INTERVAL_SECONDS
                 logger.exception(
                     "Error in expiry worker loop",
                     extra={
                         "event": "expiry_worker_error",
-                        "correlation_id": get_correlation_id() or "expiry-worker",
+                        "correlation_id": correlation_id,
                     },
                 )
-            finally:
-                session.close()
 
-            time.sleep(POLL_INTERVAL_SECONDS)
+            listener = _wait_for_next_cycle(
+                listener,
+                _seconds_until(next_expiry, max_wait),
+            )
 
 
 def start_expiry_worker(app: Flask) -> None:
@@ -105,6 +207,11 @@ def start_expiry_worker(app: Flask) -> None:
     """
 
     global _worker_started
+    # Fast path once started; re-checked under the lock (double-checked
+    # locking) so concurrent first calls still start a single thread.
+    if _worker_started:
+        return
+
     with _worker_lock:
         if _worker_started:
             return
@@ -0,0 +1,53 @@
+"""
+Gunicorn configuration for serving the API.
+
+Every endpoint is a thin HTTP -> PostgreSQL round-trip, so workers spend most
+of their time waiting on database I/O. gevent workers let a single process
+multiplex many in-flight requests instead of blocking on each query; set
+``GUNICORN_WORKER_CLASS=gthread`` to use a plain thread pool instead.
+
+Usage::
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+"""
+
+import multiprocessing
+import os
+
+
+bind = f"{os.getenv('FLASK_RUN_HOST', '0.0.0.0')}:{os.getenv('FLASK_RUN_PORT', '5000')}"
+# SO_REUSEPORT lets the kernel spread incoming connections across workers.
+reuse_port = True
+keepalive = 5
+
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gevent")
+workers = int(os.getenv("GUNICORN_WORKERS", str(multiprocessing.cpu_count() * 2 + 1)))
+worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", "1000"))
+# Only used by the gthread worker class.
+threads = int(os.getenv("GUNICORN_THREADS", "4"))
+
+# create_app starts background threads (expiry worker, access log flusher)
+# and opens the connection pool, none of which survive a fork. Preloading is
+# therefore opt-in, for setups that run those elsewhere.
+preload_app = os.getenv("GUNICORN_PRELOAD", "false").lower() in ("1", "true", "yes")
+
+
+def post_fork(server, worker):
+    # A preloaded app was created in the master. Each worker must open its own
+    # database connections (the inherited ones stay with the master) and run
+    # its own access log flusher, or buffered rows would never be written.
+    if not server.cfg.preload_app:
+        return
+
+    from app.db import get_engine
+    from app.worker.access_log_buffer import start_access_log_buffer
+
+    get_engine().dispose(close=False)
+    app = worker.app.wsgi()
+    if not app.config.get("TESTING", False):
+        start_access_log_buffer(app)
+
+# Recycle workers periodically to bound memory growth; the jitter keeps them
+# from restarting all at once.
+max_requests = 500
+max_requests_jitter = 200
@@ -44,6 +44,9 @@ def run_migrations_offline() -> None:
 def run_migrations_online() -> None:
     """Run migrations in 'online' mode."""
     configuration = config.get_section(config.config_ini_section) or {}
+    # One ``alembic`` invocation opens exactly one connection and applies every
+    # pending revision over it, so a persistent pool would never be reused;
+    # NullPool just closes that connection when we are done.
     connectable = engine_from_config(
         configuration,
         prefix="sqlalchemy.",
@@ -0,0 +1,42 @@
+"""notify expiry worker when paste expiry changes
+
+Revision ID: 002_expiry_notify
+Revises: 001_initial
+Create Date: 2026-10-14 09:00:00.000000
+
+"""
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '002_expiry_notify'
+down_revision = '001_initial'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # The expiry worker LISTENs on this channel and re-plans its next wake-up
+    # instead of polling on a fixed interval.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION notify_paste_expiry_changed()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            IF NEW.expires_at IS NOT NULL THEN
+                PERFORM pg_notify('paste_expiry_changed', '');
+            END IF;
+            RETURN NEW;
+        END;
+        $$ language 'plpgsql';
+    """)
+    op.execute("""
+        CREATE TRIGGER notify_pastes_expiry_changed
+        AFTER INSERT OR UPDATE OF expires_at ON pastes
+        FOR EACH ROW EXECUTE FUNCTION notify_paste_expiry_changed();
+    """)
+
+
+def downgrade() -> None:
+    op.execute('DROP TRIGGER IF EXISTS notify_pastes_expiry_changed ON pastes')
+    op.execute('DROP FUNCTION IF EXISTS notify_paste_expiry_changed()')
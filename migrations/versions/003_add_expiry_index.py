@@ -0,0 +1,40 @@
+"""add partial index for the expiry worker
+
+Revision ID: 003_expiry_index
+Revises: 002_expiry_notify
+Create Date: 2026-10-14 10:00:00.000000
+
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '003_expiry_index'
+down_revision = '002_expiry_notify'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY avoids locking writes on pastes, but cannot run inside a
+    # transaction block.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_pastes_expiry',
+            'pastes',
+            ['expires_at'],
+            unique=False,
+            postgresql_where=sa.text("status IN ('ACTIVE', 'VIEWED') AND expires_at IS NOT NULL"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_pastes_expiry',
+            table_name='pastes',
+            postgresql_concurrently=True,
+        )
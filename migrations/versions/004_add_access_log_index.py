@@ -0,0 +1,51 @@
+"""index access logs by paste and access time
+
+Revision ID: 004_access_log_index
+Revises: 003_expiry_index
+Create Date: 2026-10-14 12:00:00.000000
+
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '004_access_log_index'
+down_revision = '003_expiry_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # The composite index has paste_id as its leading column, so it also
+    # covers the foreign key and the old single-column index is redundant.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_access_logs_paste_id_accessed_at',
+            'access_logs',
+            ['paste_id', sa.text('accessed_at DESC')],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_access_logs_paste_id',
+            table_name='access_logs',
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_access_logs_paste_id',
+            'access_logs',
+            ['paste_id'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_access_logs_paste_id_accessed_at',
+            table_name='access_logs',
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,39 @@
+"""drop the updated_at trigger on pastes
+
+Revision ID: 005_drop_updated_at_trigger
+Revises: 004_access_log_index
+Create Date: 2026-10-14 12:30:00.000000
+
+"""
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '005_drop_updated_at_trigger'
+down_revision = '004_access_log_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # updated_at is set by the application (``onupdate=func.now()`` on the
+    # model), which renders ``updated_at=now()`` into every UPDATE it issues.
+    op.execute('DROP TRIGGER IF EXISTS update_pastes_updated_at ON pastes')
+    op.execute('DROP FUNCTION IF EXISTS update_updated_at_column()')
+
+
+def downgrade() -> None:
+    op.execute("""
+        CREATE OR REPLACE FUNCTION update_updated_at_column()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            NEW.updated_at = now();
+            RETURN NEW;
+        END;
+        $$ language 'plpgsql';
+    """)
+    op.execute("""
+        CREATE TRIGGER update_pastes_updated_at BEFORE UPDATE ON pastes
+        FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+    """)
@@ -1,12 +1,35 @@
 from __future__ import annotations
 
 import os
+import sys
+from pathlib import Path
 
-from app import create_app
+
+BASE_DIR = Path(__file__).resolve().parent
 
 
 def main() -> None:
     env = os.getenv("APP_ENV", "development")
+
+    if env == "production":
+        # Serve through gunicorn (see gunicorn.conf.py) rather than Flask's
+        # single-process development server. The app is not imported here so
+        # that wsgi.py can apply the gevent patch before it loads.
+        from gunicorn.app.wsgiapp import run
+
+        sys.argv = [
+            "gunicorn",
+            "--chdir",
+            str(BASE_DIR),
+            "-c",
+            str(BASE_DIR / "gunicorn.conf.py"),
+            "wsgi:app",
+        ]
+        run()
+        return
+
+    from app import create_app
+
     app = create_app(env)
 
     host = os.getenv("FLASK_RUN_HOST", "0.0.0.0")
@@ -17,4 +40,3 @@ def main() -> None:
 
 if __name__ == "__main__":
     main()
-
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import atexit
+from collections.abc import Callable, Generator
+from contextlib import AbstractContextManager, contextmanager
+
+import pytest
+from sqlalchemy import Connection, create_engine, event
+from sqlalchemy.pool import StaticPool
+
+from app.db import Base
+# Import models so that Base.metadata is populated before create_all.
+from app.domain import models as _models  # noqa: F401
+from app.services.paste_service import _clear_terminal_cache
+
+
+QueryCounter = Callable[[Connection], AbstractContextManager[list[str]]]
+
+
+@pytest.fixture(scope="session")
+def engine() -> Generator:
+    """
+    Create a single in-memory SQLite engine (and schema) for the test session.
+
+    StaticPool keeps every checkout on the same DBAPI connection, so the
+    in-memory database lives as long as the engine. Tests stay isolated by
+    running inside a transaction that is rolled back on teardown.
+    """
+
+    engine = create_engine(
+        "sqlite+pysqlite:///:memory:",
+        future=True,
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
+    )
+
+    @event.listens_for(engine, "connect")
+    def _configure_sqlite(dbapi_connection, _record) -> None:
+        # pysqlite's own transaction handling breaks SAVEPOINTs; let
+        # SQLAlchemy emit BEGIN itself (see the SQLAlchemy SQLite dialect docs).
+        dbapi_connection.isolation_level = None
+
+        # The database is throwaway, so skip durability work on every commit.
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA synchronous=OFF")
+        cursor.execute("PRAGMA journal_mode=MEMORY")
+        cursor.execute("PRAGMA locking_mode=EXCLUSIVE")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+
+    @event.listens_for(engine, "begin")
+    def _emit_begin(conn) -> None:
+        conn.exec_driver_sql("BEGIN")
+
+    # The database is brand new, so skip the per-table existence checks.
+    Base.metadata.create_all(engine, checkfirst=False)
+    # Disposing closes the only connection and with it the database, so do it
+    # once when the interpreter exits rather than as part of fixture teardown.
+    atexit.register(engine.dispose)
+    yield engine
+
+
+@pytest.fixture(scope="function")
+def connection(engine) -> Generator[Connection, None, None]:
+    """
+    Connection holding an outer transaction that is rolled back after each test.
+
+    Sessions bound to it with ``join_transaction_mode="create_savepoint"``
+    commit into SAVEPOINTs, so nothing a test writes outlives it.
+    """
+
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        try:
+            yield connection
+        finally:
+            transaction.rollback()
+
+
+@contextmanager
+def _count_queries(connection: Connection) -> Generator[list[str], None, None]:
+    queries: list[str] = []
+
+    def _record(_conn, _cursor, statement: str, _params, _context, _executemany) -> None:
+        queries.append(statement)
+
+    event.listen(connection, "before_cursor_execute", _record)
+    try:
+        yield queries
+    finally:
+        event.remove(connection, "before_cursor_execute", _record)
+
+
+@pytest.fixture(autouse=True)
+def clear_terminal_cache() -> Generator[None, None, None]:
+    """
+    Empty the process-wide terminal-paste cache around every test.
+
+    Each test's writes are rolled back, but cached EXPIRED/DELETED ids would
+    otherwise survive and answer later tests without reaching the database.
+    """
+
+    _clear_terminal_cache()
+    yield
+    _clear_terminal_cache()
+
+
+@pytest.fixture(scope="session")
+def count_queries() -> QueryCounter:
+    """Context manager collecting every SQL statement executed on a connection."""
+
+    return _count_queries
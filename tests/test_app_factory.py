@@ -1,11 +1,105 @@
 from __future__ import annotations
 
+from collections.abc import Generator
+
+import pytest
 from flask import Flask
+from flask.testing import FlaskClient
+from itsdangerous import TimestampSigner
+from sqlalchemy import Connection
 
 from app import create_app
+from app.db import SessionLocal
+from app.services.helpers import sign_view_token
+
+
+@pytest.fixture
+def client(connection: Connection) -> Generator[FlaskClient, None, None]:
+    """Test client whose request sessions run on the rolled-back test connection."""
+
+    app = create_app("testing")
+    SessionLocal.remove()
+    SessionLocal.configure(bind=connection, join_transaction_mode="create_savepoint")
+    yield app.test_client()
+    SessionLocal.remove()
+
+
+def _create_protected_paste(client: FlaskClient, password: str = "hunter2") -> str:
+    response = client.post(
+        "/pastes",
+        json={"content": "protected", "max_views": 5, "password": password},
+    )
+    assert response.status_code == 201
+    return response.get_json()["id"]
 
 
 def test_create_app_returns_flask_instance() -> None:
     app = create_app("testing")
     assert isinstance(app, Flask)
 
+
+def test_health_supports_conditional_get() -> None:
+    client = create_app("testing").test_client()
+
+    first = client.get("/health")
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+
+    cached = client.get("/health", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.data == b""
+
+
+def test_create_paste_requires_json_content_type(client: FlaskClient) -> None:
+    body = '{"content": "hi", "max_views": 1}'
+
+    rejected = client.post("/pastes", data=body, content_type="text/plain")
+    assert rejected.status_code == 400
+
+    assert client.post("/pastes", data=body, content_type="application/json").status_code == 201
+    # An empty body is treated as ``{}`` and fails field validation instead.
+    assert client.post("/pastes").status_code == 400
+
+
+def test_view_token_round_trip(client: FlaskClient) -> None:
+    paste_id = _create_protected_paste(client)
+
+    assert client.post(f"/pastes/{paste_id}/view").status_code == 401
+
+    first = client.post(f"/pastes/{paste_id}/view", json={"password": "hunter2"})
+    assert first.status_code == 200
+    token = first.get_json()["view_token"]
+
+    again = client.post(f"/pastes/{paste_id}/view", headers={"X-Paste-Token": token})
+    assert again.status_code == 200
+    assert again.get_json()["content"] == "protected"
+    assert again.get_json()["current_views"] == 2
+
+
+def test_forged_or_misdirected_view_token_is_rejected(client: FlaskClient) -> None:
+    paste_id = _create_protected_paste(client)
+    other_id = _create_protected_paste(client)
+    secret_key = client.application.config["SECRET_KEY"]
+
+    issued = client.post(f"/pastes/{paste_id}/view", json={"password": "hunter2"})
+    token = issued.get_json()["view_token"]
+
+    forged = [
+        # A token issued for a different paste (same password).
+        (other_id, token),
+        # A validly signed paste id that is not bound to the password hash.
+        (paste_id, TimestampSigner(secret_key, salt="paste-view-token").sign(paste_id).decode()),
+        # A token bound to some other password hash.
+        (paste_id, sign_view_token(paste_id, "not-the-hash", secret_key)),
+    ]
+    for target, forged_token in forged:
+        response = client.post(f"/pastes/{target}/view", headers={"X-Paste-Token": forged_token})
+        assert response.status_code == 401
+
+
+def test_app_refuses_default_secret_key_outside_testing(monkeypatch: pytest.MonkeyPatch) -> None:
+    from app.config import DEFAULT_SECRET_KEY, ProductionConfig
+
+    monkeypatch.setattr(ProductionConfig, "SECRET_KEY", DEFAULT_SECRET_KEY)
+    with pytest.raises(RuntimeError, match="SECRET_KEY"):
+        create_app("production")
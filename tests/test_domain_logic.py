@@ -1,27 +1,48 @@
 from __future__ import annotations
 
+import os
 from datetime import datetime, timedelta, timezone
-from typing import Generator
-from uuid import UUID
+from functools import partial
+from collections.abc import Callable
+from contextlib import AbstractContextManager, contextmanager
+from typing import Any, Generator
+from uuid import UUID, uuid4
 
 import pytest
-from sqlalchemy import Select, create_engine, select
+from flask import Flask
+from sqlalchemy import (
+    Connection,
+    Select,
+    bindparam,
+    create_engine,
+    delete,
+    func,
+    select,
+)
 from sqlalchemy.orm import Session, sessionmaker
 
-from app.db import Base
 from app.domain.models import AccessLog, Paste, PasteStatus
 from app.domain.state_machine import (
     InvalidPasteStateTransition,
     validate_transition,
 )
-from app.repositories.paste_repository import (
-    AccessLogRepository,
-    PasteRepository,
-)
+from app.repositories.paste_repository import PasteRepository
+from app.services.helpers import hash_password
+from app.worker.access_log_buffer import MAX_FLUSH_ATTEMPTS, AccessLogBuffer
 from app.services.paste_service import (
     PasteNotFoundError,
     PasteService,
     PasteUnavailableError,
+    _clear_terminal_cache,
+)
+
+
+# Selection used by the expiry worker, built once with a ``now`` bind
+# parameter (as the repository does for its hot-path statements).
+_OVERDUE_PASTES: Select[tuple[Paste]] = select(Paste).where(
+    Paste.status.in_([PasteStatus.ACTIVE, PasteStatus.VIEWED]),
+    Paste.expires_at.isnot(None),
+    Paste.expires_at < bindparam("now"),
 )
 
 
@@ -30,29 +51,100 @@ from app.services.paste_service import (
 # ---------------------------------------------------------------------------
 
 
-@pytest.fixture(scope="function")
-def engine() -> Generator:
+@pytest.fixture(scope="session")
+def SessionLocal() -> sessionmaker:
     """
-    Create a fresh in-memory SQLite engine for each test function.
+    One sessionmaker shared by every test; sessions are bound per test with
+    ``SessionLocal(bind=connection)``.
 
-    This keeps tests focused on domain behavior while using a real database
-    session for repository/service operations.
+    Attributes stay loaded after commit, so tests can assert on them without
+    refresh round trips.
     """
 
-    engine = create_engine("sqlite+pysqlite:///:memory:", future=True)
-    Base.metadata.create_all(engine)
-    try:
-        yield engine
-    finally:
-        engine.dispose()
+    return sessionmaker(
+        join_transaction_mode="create_savepoint",
+        autoflush=False,
+        autocommit=False,
+        expire_on_commit=False,
+        future=True,
+    )
 
 
 @pytest.fixture(scope="function")
-def session(engine) -> Generator[Session, None, None]:
-    SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
-    with SessionLocal() as session:
+def session(SessionLocal: sessionmaker, connection: Connection) -> Generator[Session, None, None]:
+    with SessionLocal(bind=connection) as session:
         yield session
-        session.rollback()
+        # Only tests that left a transaction open have a SAVEPOINT to discard;
+        # the outer connection rollback undoes everything else.
+        if session.in_transaction():
+            session.rollback()
+
+
+@pytest.fixture(scope="session")
+def make_paste_kwargs() -> Callable[..., dict[str, Any]]:
+    """
+    Build column values for seeding a Paste row.
+
+    Seeded rows go through Core ``Paste.__table__.insert()`` and skip the ORM
+    constructor and its validators; tests exercising those build Paste directly.
+    """
+
+    def make(**overrides: Any) -> dict[str, Any]:
+        return {
+            "id": uuid4(),
+            "max_views": 5,
+            "current_views": 0,
+            "status": PasteStatus.ACTIVE,
+            **overrides,
+        }
+
+    return make
+
+
+@pytest.fixture
+def seed_paste(
+    session: Session,
+    make_paste_kwargs: Callable[..., dict[str, Any]],
+) -> Callable[..., UUID]:
+    """Insert and commit one Paste row built from ``make_paste_kwargs``; returns its id."""
+
+    def seed(**overrides: Any) -> UUID:
+        row = make_paste_kwargs(**overrides)
+        session.execute(Paste.__table__.insert(), [row])
+        session.commit()
+        return row["id"]
+
+    return seed
+
+
+@pytest.fixture(scope="module")
+def seeded_pastes(
+    engine,
+    make_paste_kwargs: Callable[..., dict[str, Any]],
+) -> Generator[dict[str, UUID], None, None]:
+    """
+    Canonical pastes committed once per module, keyed by name.
+
+    Tests that mutate them run inside the per-test rolled-back transaction,
+    so every test sees the seed as inserted here.
+    """
+
+    rows = {
+        "expired": make_paste_kwargs(
+            content="secret", current_views=1, status=PasteStatus.EXPIRED
+        ),
+        "deleted": make_paste_kwargs(content="removed", status=PasteStatus.DELETED),
+        "single_view": make_paste_kwargs(content="once only", max_views=1),
+    }
+    with engine.begin() as connection:
+        connection.execute(Paste.__table__.insert(), list(rows.values()))
+
+    yield {name: row["id"] for name, row in rows.items()}
+
+    with engine.begin() as connection:
+        connection.execute(
+            delete(Paste).where(Paste.id.in_([row["id"] for row in rows.values()]))
+        )
 
 
 @pytest.fixture
@@ -61,17 +153,36 @@ def paste_repo(session: Session) -> PasteRepository:
 
 
 @pytest.fixture
-def access_log_repo(session: Session) -> AccessLogRepository:
-    return AccessLogRepository(session=session)
+def paste_service(SessionLocal: sessionmaker, connection: Connection) -> PasteService:
+    """Service with its own session factory; each call gets a new session on the test connection."""
+    return PasteService(session_factory=partial(SessionLocal, bind=connection))
+
+
+BatchingSessionFactory = Callable[[], AbstractContextManager[Callable[[], Session]]]
 
 
 @pytest.fixture
-def paste_service(engine) -> PasteService:
-    """Service with its own session factory; each call gets a new session from the test engine."""
-    from app.services.paste_service import PasteService
+def batching_session_factory(
+    SessionLocal: sessionmaker,
+    connection: Connection,
+    monkeypatch: pytest.MonkeyPatch,
+) -> BatchingSessionFactory:
+    """
+    Context manager yielding a session factory whose commits are deferred.
+
+    Every call inside the block returns the same session, and its ``commit``
+    only flushes; the single real commit happens when the block exits.
+    """
+
+    @contextmanager
+    def batching() -> Generator[Callable[[], Session], None, None]:
+        with SessionLocal(bind=connection) as batch_session:
+            with monkeypatch.context() as patch:
+                patch.setattr(batch_session, "commit", batch_session.flush)
+                yield lambda: batch_session
+            batch_session.commit()
 
-    session_factory = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
-    return PasteService(session_factory=session_factory)
+    return batching
 
 
 # ---------------------------------------------------------------------------
@@ -83,25 +194,27 @@ def test_invalid_state_transition_fails() -> None:
     with pytest.raises(InvalidPasteStateTransition):
         validate_transition(PasteStatus.EXPIRED, PasteStatus.ACTIVE)
 
+    # Unknown (even unhashable) states are rejected with the domain error.
+    with pytest.raises(InvalidPasteStateTransition):
+        validate_transition(PasteStatus.ACTIVE, ["VIEWED"])
+
 
 # ---------------------------------------------------------------------------
 # 2. Expired paste cannot be accessed.
 # ---------------------------------------------------------------------------
 
 
-def test_expired_paste_cannot_be_accessed(session: Session, paste_service: PasteService) -> None:
-    # Create an already-expired paste (by status).
-    paste = Paste(
-        content="secret",
-        max_views=5,
-        current_views=1,
-        status=PasteStatus.EXPIRED,
-    )
-    session.add(paste)
-    session.commit()
-
+@pytest.mark.parametrize("seed", ["expired", "deleted"])
+def test_expired_paste_cannot_be_accessed(
+    seeded_pastes: dict[str, UUID],
+    paste_service: PasteService,
+    seed: str,
+) -> None:
+    # Pastes in a terminal state (by status) cannot be viewed.
     with pytest.raises(PasteUnavailableError):
-        paste_service.retrieve_paste_for_view(paste_id=paste.id, ip_address="127.0.0.1")
+        paste_service.retrieve_paste_for_view(
+            paste_id=seeded_pastes[seed], ip_address="127.0.0.1"
+        )
 
 
 # ---------------------------------------------------------------------------
@@ -112,43 +225,49 @@ def test_expired_paste_cannot_be_accessed(session: Session, paste_service: Paste
 
 def test_view_limit_enforced_and_access_log_created(
     session: Session,
+    seeded_pastes: dict[str, UUID],
     paste_service: PasteService,
-    engine,
+    connection: Connection,
+    count_queries: Callable[[Connection], AbstractContextManager[list[str]]],
 ) -> None:
     # Paste with a single allowed view.
-    paste = Paste(
-        content="once only",
-        max_views=1,
-        current_views=0,
-        status=PasteStatus.ACTIVE,
-    )
-    session.add(paste)
-    session.commit()
+    paste_id = seeded_pastes["single_view"]
 
     # First view should succeed and consume the single allowed view.
-    viewed = paste_service.retrieve_paste_for_view(
-        paste_id=paste.id,
-        ip_address="127.0.0.1",
-    )
+    with count_queries(connection) as queries:
+        viewed = paste_service.retrieve_paste_for_view(
+            paste_id=paste_id,
+            ip_address="127.0.0.1",
+        )
+    # One guarded UPDATE ... RETURNING and the access log INSERT, inside the
+    # service session's SAVEPOINT.
+    assert [query.split(maxsplit=1)[0] for query in queries] == [
+        "SAVEPOINT",
+        "UPDATE",
+        "INSERT",
+        "RELEASE",
+    ], queries
     # Service returns a dict DTO.
     assert viewed["current_views"] == 1
     assert viewed["max_views"] == 1
     assert viewed["status"] == "EXPIRED"
 
-    # An AccessLog entry should have been created (in the service's session).
-    # Use a new session to see committed data.
-    SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
-    with SessionLocal() as s:
-        stmt: Select[AccessLog] = select(AccessLog).where(AccessLog.paste_id == paste.id)
-        logs = s.execute(stmt).scalars().all()
-    assert len(logs) == 1
-    assert logs[0].ip_address == "127.0.0.1"
-    assert logs[0].success is True
-
-    # Second view attempt should fail because paste is expired.
+    # Exactly one AccessLog entry should have been created (in the service's
+    # session); ``one()`` enforces the count and only two columns are loaded.
+    ip_address, success = session.execute(
+        select(AccessLog.ip_address, AccessLog.success).where(
+            AccessLog.paste_id == paste_id
+        )
+    ).one()
+    assert ip_address == "127.0.0.1"
+    assert success is True
+
+    # Second view attempt should fail because paste is expired; clear the
+    # terminal cache so the database guard answers, not the cache.
+    _clear_terminal_cache()
     with pytest.raises(PasteUnavailableError):
         paste_service.retrieve_paste_for_view(
-            paste_id=paste.id,
+            paste_id=paste_id,
             ip_address="127.0.0.1",
         )
 
@@ -179,41 +298,79 @@ def test_paste_content_is_immutable(session: Session) -> None:
 # ---------------------------------------------------------------------------
 
 
-def test_expiry_worker_like_logic_expires_pastes(session: Session, paste_repo: PasteRepository) -> None:
+def test_expiry_worker_like_logic_expires_pastes(
+    session: Session,
+    make_paste_kwargs: Callable[..., dict[str, Any]],
+    paste_repo: PasteRepository,
+) -> None:
     now_utc = datetime.now(timezone.utc)
 
-    should_expire = Paste(
+    should_expire = make_paste_kwargs(
         content="expired by worker",
-        max_views=5,
-        current_views=0,
-        status=PasteStatus.ACTIVE,
         expires_at=now_utc - timedelta(seconds=1),
     )
-    should_stay_active = Paste(
+    should_stay_active = make_paste_kwargs(
         content="still active",
-        max_views=5,
-        current_views=0,
-        status=PasteStatus.ACTIVE,
         expires_at=now_utc + timedelta(hours=1),
     )
-    session.add_all([should_expire, should_stay_active])
-    session.commit()
+    # One INSERT statement executed with both parameter sets.
+    session.execute(Paste.__table__.insert(), [should_expire, should_stay_active])
 
     # Mimic the selection logic used by the expiry worker.
-    stmt: Select[Paste] = select(Paste).where(
-        Paste.status.in_([PasteStatus.ACTIVE, PasteStatus.VIEWED]),
-        Paste.expires_at.isnot(None),
-        Paste.expires_at < now_utc,
-    )
-    for paste in session.execute(stmt).scalars().all():
+    for paste in session.execute(_OVERDUE_PASTES, {"now": now_utc}).scalars().all():
         paste_repo.update_status_via_state_machine(paste, PasteStatus.EXPIRED)
 
     session.commit()
-    session.refresh(should_expire)
-    session.refresh(should_stay_active)
 
-    assert should_expire.status == PasteStatus.EXPIRED
-    assert should_stay_active.status == PasteStatus.ACTIVE
+    # Persisted state for both rows in a single query.
+    persisted = dict(
+        session.execute(
+            select(Paste.id, Paste.status).where(
+                Paste.id.in_([should_expire["id"], should_stay_active["id"]])
+            )
+        ).all()
+    )
+    assert persisted == {
+        should_expire["id"]: PasteStatus.EXPIRED,
+        should_stay_active["id"]: PasteStatus.ACTIVE,
+    }
+
+
+def test_expiry_worker_bulk_update_path(
+    session: Session,
+    make_paste_kwargs: Callable[..., dict[str, Any]],
+    paste_repo: PasteRepository,
+) -> None:
+    now_utc = datetime.now(timezone.utc)
+    overdue = now_utc - timedelta(seconds=1)
+
+    active = make_paste_kwargs(content="overdue active", expires_at=overdue)
+    viewed = make_paste_kwargs(
+        content="overdue viewed", current_views=1, status=PasteStatus.VIEWED, expires_at=overdue
+    )
+    deleted = make_paste_kwargs(
+        content="overdue deleted", status=PasteStatus.DELETED, expires_at=overdue
+    )
+    future = make_paste_kwargs(content="not yet", expires_at=now_utc + timedelta(hours=1))
+    rows = [active, viewed, deleted, future]
+    session.execute(Paste.__table__.insert(), rows)
+
+    # The worker's path: one UPDATE ... RETURNING, no entities loaded.
+    expired_ids = paste_repo.expire_overdue_pastes(now_utc)
+    session.commit()
+
+    assert set(expired_ids) == {active["id"], viewed["id"]}
+    persisted = dict(
+        session.execute(
+            select(Paste.id, Paste.status).where(Paste.id.in_([row["id"] for row in rows]))
+        ).all()
+    )
+    assert persisted == {
+        active["id"]: PasteStatus.EXPIRED,
+        viewed["id"]: PasteStatus.EXPIRED,
+        deleted["id"]: PasteStatus.DELETED,
+        future["id"]: PasteStatus.ACTIVE,
+    }
 
 
 # ---------------------------------------------------------------------------
@@ -221,18 +378,20 @@ def test_expiry_worker_like_logic_expires_pastes(session: Session, paste_repo: P
 # ---------------------------------------------------------------------------
 
 
-def test_atomic_view_increment(session: Session, paste_repo: PasteRepository) -> None:
-    paste = Paste(
+def test_atomic_view_increment(
+    session: Session,
+    make_paste_kwargs: Callable[..., dict[str, Any]],
+    paste_repo: PasteRepository,
+) -> None:
+    paste = make_paste_kwargs(
         content="increment views",
         max_views=10,
-        current_views=0,
-        status=PasteStatus.ACTIVE,
     )
-    session.add(paste)
-    session.commit()
+    # Inserted immediately, without a commit; everything commits once below.
+    session.execute(Paste.__table__.insert(), [paste])
 
-    first = paste_repo.increment_view_count_atomic(paste.id)
-    second = paste_repo.increment_view_count_atomic(paste.id)
+    first = paste_repo.increment_view_count_atomic(paste["id"])
+    second = paste_repo.increment_view_count_atomic(paste["id"])
     session.commit()
 
     # Values returned by the repository should reflect consecutive increments.
@@ -240,7 +399,222 @@ def test_atomic_view_increment(session: Session, paste_repo: PasteRepository) ->
     assert second == 2
 
     # Database state should match the last value.
-    refreshed = session.get(Paste, paste.id)
+    refreshed = session.get(Paste, paste["id"])
     assert refreshed is not None
     assert refreshed.current_views == 2
 
+
+# ---------------------------------------------------------------------------
+# 8. Password-protected views transition ACTIVE → VIEWED → EXPIRED.
+# ---------------------------------------------------------------------------
+
+
+def test_password_protected_view_transitions(
+    seed_paste: Callable[..., UUID],
+    paste_service: PasteService,
+) -> None:
+    paste_id = seed_paste(
+        content="protected",
+        max_views=2,
+        password_hash=hash_password("hunter2"),
+    )
+
+    with pytest.raises(PermissionError):
+        paste_service.retrieve_paste_for_view(paste_id=paste_id, provided_password="wrong")
+
+    first = paste_service.retrieve_paste_for_view(paste_id=paste_id, provided_password="hunter2")
+    assert first["current_views"] == 1
+    assert first["status"] == "VIEWED"
+
+    second = paste_service.retrieve_paste_for_view(paste_id=paste_id, password_verified=True)
+    assert second["current_views"] == 2
+    assert second["status"] == "EXPIRED"
+
+    with pytest.raises(PasteUnavailableError):
+        paste_service.retrieve_paste_for_view(paste_id=paste_id, provided_password="hunter2")
+
+
+# ---------------------------------------------------------------------------
+# 9. Buffered access logs are flushed in batches.
+# ---------------------------------------------------------------------------
+
+
+def test_access_log_buffer_flushes_in_batches(
+    session: Session,
+    seed_paste: Callable[..., UUID],
+    SessionLocal: sessionmaker,
+    connection: Connection,
+) -> None:
+    paste_id = seed_paste(content="buffered", max_views=10)
+
+    buffer = AccessLogBuffer(
+        session_factory=partial(SessionLocal, bind=connection),
+        batch_size=2,
+    )
+    for _ in range(3):
+        buffer.enqueue({"paste_id": paste_id, "ip_address": "127.0.0.1", "success": True})
+
+    assert buffer.flush() == 3
+    assert buffer.flush() == 0
+
+    logs = session.execute(select(AccessLog).where(AccessLog.paste_id == paste_id)).scalars().all()
+    assert len(logs) == 3
+
+
+def test_access_log_buffer_keeps_rows_when_flush_fails(
+    SessionLocal: sessionmaker,
+    connection: Connection,
+) -> None:
+    buffer = AccessLogBuffer(session_factory=partial(SessionLocal, bind=connection))
+    # A row without ``paste_id`` makes the batch write fail.
+    buffer.enqueue({"ip_address": "127.0.0.1"})
+
+    # The failed batch is retried on each flush, then dropped.
+    for _ in range(MAX_FLUSH_ATTEMPTS - 1):
+        assert buffer.flush() == 0
+        assert buffer.pending == 1
+    assert buffer.flush() == 0
+    assert buffer.pending == 0
+
+
+@pytest.mark.skipif(
+    not os.getenv("POSTGRES_TEST_URL"),
+    reason="POSTGRES_TEST_URL (a migrated PostgreSQL database) is not set",
+)
+def test_access_log_buffer_copies_batches_on_postgres(
+    make_paste_kwargs: Callable[..., dict[str, Any]],
+    SessionLocal: sessionmaker,
+    count_queries: Callable[[Connection], AbstractContextManager[list[str]]],
+) -> None:
+    pg_engine = create_engine(os.environ["POSTGRES_TEST_URL"])
+    assert pg_engine.dialect.driver == "psycopg"
+    try:
+        with pg_engine.connect() as pg_connection:
+            transaction = pg_connection.begin()
+            paste = make_paste_kwargs(content="copied logs")
+            pg_connection.execute(Paste.__table__.insert(), [paste])
+
+            buffer = AccessLogBuffer(
+                session_factory=partial(SessionLocal, bind=pg_connection),
+                batch_size=3,
+            )
+            for octet in range(3):
+                buffer.enqueue({"paste_id": paste["id"], "ip_address": f"10.0.0.{octet}"})
+
+            with count_queries(pg_connection) as queries:
+                assert buffer.flush() == 3
+            # COPY runs on the raw cursor; no INSERT went through SQLAlchemy.
+            assert not [query for query in queries if "INSERT" in query], queries
+
+            ips = pg_connection.execute(
+                select(AccessLog.ip_address).where(AccessLog.paste_id == paste["id"])
+            ).scalars().all()
+            assert sorted(ips) == ["10.0.0.0", "10.0.0.1", "10.0.0.2"]
+            transaction.rollback()
+    finally:
+        pg_engine.dispose()
+
+
+def test_buffered_view_queues_access_log_after_commit(
+    session: Session,
+    seed_paste: Callable[..., UUID],
+    SessionLocal: sessionmaker,
+    connection: Connection,
+) -> None:
+    paste_id = seed_paste(content="buffered view", max_views=5)
+    session_factory = partial(SessionLocal, bind=connection)
+    buffer = AccessLogBuffer(session_factory=session_factory)
+    app = Flask(__name__)
+    # The flusher thread sleeps through the test; rows are flushed explicitly.
+    app.config["ACCESS_LOG_BATCH_MS"] = 600_000
+    buffer.start(app)
+    service = PasteService(session_factory=session_factory, access_log_buffer=buffer)
+
+    service.retrieve_paste_for_view(paste_id=paste_id, ip_address="127.0.0.1")
+
+    count_logs = select(func.count(AccessLog.id)).where(AccessLog.paste_id == paste_id)
+    assert buffer.pending == 1
+    assert session.execute(count_logs).scalar_one() == 0
+
+    assert buffer.flush() == 1
+    assert session.execute(count_logs).scalar_one() == 1
+
+
+# ---------------------------------------------------------------------------
+# 10. Terminal pastes are rejected without a database round trip.
+# ---------------------------------------------------------------------------
+
+
+def test_terminal_paste_rejected_from_cache(
+    seed_paste: Callable[..., UUID],
+    paste_service: PasteService,
+) -> None:
+    paste_id = seed_paste(content="gone soon", max_views=1)
+
+    assert paste_service.retrieve_paste_for_view(paste_id=paste_id)["status"] == "EXPIRED"
+
+    def no_session() -> Session:
+        raise AssertionError("terminal paste should not open a session")
+
+    cached_service = PasteService(session_factory=no_session)
+    with pytest.raises(PasteUnavailableError):
+        cached_service.retrieve_paste_for_view(paste_id=paste_id)
+
+
+# ---------------------------------------------------------------------------
+# 11. Status transitions are picked up by dirty tracking.
+# ---------------------------------------------------------------------------
+
+
+def test_status_transition_marks_paste_dirty(
+    session: Session,
+    seed_paste: Callable[..., UUID],
+    paste_repo: PasteRepository,
+) -> None:
+    paste = session.get(Paste, seed_paste(content="tracked", max_views=3))
+
+    paste_repo.update_status_via_state_machine(paste, "VIEWED")
+    assert paste in session.dirty
+
+    session.commit()
+    session.expire_all()
+    assert session.get(Paste, paste.id).status == PasteStatus.VIEWED
+
+
+# ---------------------------------------------------------------------------
+# 12. Views committed as one batch match views committed one by one.
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize("views", [1, 25])
+def test_many_views_batched(
+    session: Session,
+    seed_paste: Callable[..., UUID],
+    paste_service: PasteService,
+    batching_session_factory: BatchingSessionFactory,
+    views: int,
+) -> None:
+    one_by_one = seed_paste(content="committed per view", max_views=views)
+    batched = seed_paste(content="committed once", max_views=views)
+
+    for _ in range(views):
+        paste_service.retrieve_paste_for_view(paste_id=one_by_one, ip_address="127.0.0.1")
+
+    with batching_session_factory() as session_factory:
+        batched_service = PasteService(session_factory=session_factory)
+        for _ in range(views):
+            batched_service.retrieve_paste_for_view(paste_id=batched, ip_address="127.0.0.1")
+
+    def final_state(paste_id: UUID) -> tuple[Any, ...]:
+        return session.execute(
+            select(
+                Paste.current_views,
+                Paste.status,
+                select(func.count(AccessLog.id))
+                .where(AccessLog.paste_id == paste_id)
+                .scalar_subquery(),
+            ).where(Paste.id == paste_id)
+        ).one()
+
+    assert final_state(batched) == final_state(one_by_one)
+    assert final_state(batched) == (views, PasteStatus.EXPIRED, views)
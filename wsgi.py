@@ -0,0 +1,21 @@
+"""
+WSGI entrypoint used by gunicorn (see ``gunicorn.conf.py``).
+
+gevent has to patch the standard library before anything imports sockets,
+threads or the database driver, so the monkey patch must run before any
+other import in this module. psycopg 3 detects the patched ``select`` module and
+waits on the database cooperatively, so no extra driver patching is needed.
+Other worker classes (e.g. ``gthread``) run unpatched.
+"""
+
+import os
+
+if os.getenv("GUNICORN_WORKER_CLASS", "gevent") == "gevent":
+    from gevent import monkey
+
+    monkey.patch_all()
+
+from app import create_app  # noqa: E402
+
+
+app = create_app()